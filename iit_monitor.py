@@ -5,34 +5,74 @@ collections.Iterable = collections.abc.Iterable
 collections.Sequence = collections.abc.Sequence
 collections.Mapping  = collections.abc.Mapping
 
+import os
 import threading
 import time
-import pyphi
-
-# ─── PyPhi Thread‐Safe Configuration ───────────────────────────────
-# Disable all parallel evaluation steps in PyPhi
-pyphi.config.PARALLEL_CONCEPT_EVALUATION = False   # disable parallel concept finding :contentReference[oaicite:0]{index=0}
-pyphi.config.PARALLEL_CUT_EVALUATION     = False   # disable parallel cut evaluation :contentReference[oaicite:1]{index=1}
-pyphi.config.PARALLEL_COMPLEX_EVALUATION = False   # disable parallel complex evaluation :contentReference[oaicite:2]{index=2}
-# Turn off progress bars for cleaner logs
-pyphi.config.PROGRESS_BARS = False                # disable tqdm-style progress bars :contentReference[oaicite:3]{index=3}
-
-from q_core_modules.network import NETWORK                    # your local network.py
-from pyphi.compute.subsystem import phi        # the core Φ function
+from functools import lru_cache
+
+# PyPhi (and the pyphi-backed NETWORK) are imported on the first sample, not at
+# import time, so they stay off the server's cold-start path.
+pyphi = None
+phi = None            # pyphi.compute.subsystem.phi, the core Φ function
+NETWORK = None
+_pyphi_lock = threading.Lock()
+
+def _load_pyphi():
+    """Import and configure PyPhi once; returns the network being monitored."""
+    global pyphi, phi, NETWORK
+    if NETWORK is not None:
+        return NETWORK
+    with _pyphi_lock:
+        if NETWORK is None:
+            import pyphi as _pyphi
+            # ─── PyPhi Parallel Configuration ──────────────────────────
+            # sample_phi() only ever runs on the single IIT-Monitor thread, so
+            # PyPhi's own worker pool can own parallelism. Cores are capped at half
+            # the machine so the HTTP loop stays responsive; set
+            # QPF_PYPHI_PARALLEL=0 to force serial evaluation.
+            parallel = os.environ.get("QPF_PYPHI_PARALLEL", "1") != "0"
+            _pyphi.config.PARALLEL_CONCEPT_EVALUATION = parallel
+            _pyphi.config.PARALLEL_CUT_EVALUATION     = parallel
+            _pyphi.config.PARALLEL_COMPLEX_EVALUATION = parallel
+            _pyphi.config.NUMBER_OF_CORES = max(1, (os.cpu_count() or 2) // 2)
+            # Turn off progress bars for cleaner logs
+            _pyphi.config.PROGRESS_BARS = False
+
+            from pyphi.compute.subsystem import phi as _phi
+            from q_core_modules.network import NETWORK as _network   # your local network.py
+            pyphi, phi, NETWORK = _pyphi, _phi, _network
+    return NETWORK
 
 def get_state_vector():
     """
     Placeholder: returns a zero-vector for NETWORK.size.
     Replace this with your real sensor/variable sampling logic.
     """
-    return [0] * NETWORK.size
+    return [0] * _load_pyphi().size
 
 def log_phi(phi_value):
     """Handle or persist the computed Φ value."""
     print(f"[Φ] Computed Φ: {phi_value}")
 
+@lru_cache(maxsize=128)
+def _get_subsystem(state):
+    """
+    Build the NETWORK subsystem for `state` once; TPM conditioning is
+    nontrivial and NETWORK never changes.
+    """
+    return pyphi.Subsystem(NETWORK, list(state))
+
+@lru_cache(maxsize=128)
+def _compute_phi(state):
+    """
+    Φ for NETWORK in `state` (a tuple, so it can key the cache).
+    NETWORK is immutable, so a given state always yields the same Φ.
+    """
+    return phi(_get_subsystem(state))
+
 def sample_phi():
     print("[Φ] sample_phi called")  # Debug log
+    _load_pyphi()
 
     state_vector = get_state_vector()
     print(f"[Φ] State vector: {state_vector} (len={len(state_vector)})")
@@ -46,8 +86,7 @@ def sample_phi():
             f"but got {actual}: {state_vector}"
         )
 
-    subsystem = pyphi.Subsystem(NETWORK, state_vector)
-    phi_value = phi(subsystem)
+    phi_value = _compute_phi(tuple(state_vector))
     log_phi(phi_value)
 
 def start_periodic_sampling(interval_seconds: float = 10.0):
@@ -1,13 +1,15 @@
 #!/usr/bin/env python3
 import os, sys, json, datetime as _dt
-import time, threading, random, collections, re
+import time, threading, random, collections, re, queue, atexit, zlib
 from datetime import timezone, timedelta, datetime as dt
-from dateutil.relativedelta import relativedelta
 
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 import asyncio
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
+import orjson
 
 # --- QPF Math Core Integration ---
 from symbolic_modules import math_core
@@ -18,19 +20,30 @@ INTENT_KEYWORDS = {
     "task":       ["please","remind","track","add"],
     "reflection": ["think","feel","wonder","reflect"],
 }
-def tag_intent(text: str) -> str:
-    lower = text.lower()
-    for intent,kws in INTENT_KEYWORDS.items():
-        if any(k in lower for k in kws):
+def _keyword_re(keywords):
+    """One compiled alternation per keyword group: a single C-level scan instead of one `in` per keyword."""
+    return re.compile("|".join(re.escape(k) for k in sorted(keywords, key=len, reverse=True)))
+_INTENT_RES      = [(intent, _keyword_re(kws)) for intent, kws in INTENT_KEYWORDS.items()]
+_NEGATIVE_RE     = _keyword_re(("sad","upset","angry","lonely"))
+_POSITIVE_RE     = _keyword_re(("happy","joy","excited","love"))
+_EMOTION_WORD_RE = _keyword_re(("joy", "sad", "anxious", "hope", "love"))
+# The _*_of helpers take already-lowercased text so chat() can lowercase each
+# message once and share it across every keyword lookup.
+def _intent_of(lower: str) -> str:
+    for intent, rx in _INTENT_RES:
+        if rx.search(lower):
             return intent
     return "statement"
-def tag_emotion(text: str) -> str:
-    low = text.lower()
-    if any(w in low for w in ("sad","upset","angry","lonely")):
+def _emotion_of(low: str) -> str:
+    if _NEGATIVE_RE.search(low):
         return "negative"
-    if any(w in low for w in ("happy","joy","excited","love")):
+    if _POSITIVE_RE.search(low):
         return "positive"
     return "neutral"
+def tag_intent(text: str) -> str:
+    return _intent_of(text.lower())
+def tag_emotion(text: str) -> str:
+    return _emotion_of(text.lower())
 ACTION_BANK = {
     "mental_health": [
         "*virtual hug*",
@@ -62,14 +75,17 @@ CONTEXT_KEYWORDS = {
     "empathy": {"sad", "upset", "pain", "hurt", "struggle", "loss", "grief", "cry"},
     "gratitude": {"thanks", "thank you", "appreciate", "grateful", "gratitude"},
 }
-def detect_context(user_message: str) -> str:
-    msg = user_message.lower()
-    for category, keywords in CONTEXT_KEYWORDS.items():
-        if any(kw in msg for kw in keywords):
+_CONTEXT_RES = [(category, _keyword_re(kws)) for category, kws in CONTEXT_KEYWORDS.items()]
+def _context_of(msg: str) -> str:
+    for category, rx in _CONTEXT_RES:
+        if rx.search(msg):
             return category
     return "none"
-def make_action(user_message: str) -> str:
-    category = detect_context(user_message)
+def detect_context(user_message: str) -> str:
+    return _context_of(user_message.lower())
+def make_action(user_message: str, category: str = None) -> str:
+    if category is None:
+        category = detect_context(user_message)
     if category in ACTION_CONTEXTS:
         actions = ACTION_BANK[category]
         action = random.choice(actions)
@@ -78,14 +94,14 @@ def make_action(user_message: str) -> str:
 
 # --- Q Core Modules ---
 from q_core_modules.memory_graph         import MemoryGraph, MemoryEvent
-from q_core_modules.contextual_retriever import ContextualRetriever
 from q_core_modules.self_model           import SelfModel
 from q_core_modules.counterfactual       import CounterfactualEngine
-from q_core_modules.network              import NETWORK
 from q_core_modules.sensory_module       import SensoryModule
 from q_core_modules.blackboard           import Blackboard
+from q_core_modules.jsonl_writer       import enqueue_jsonl
+from q_core_modules.timestamps         import utc_now_iso
 import iit_monitor
-from q_core_modules.q_api import generate_q_response
+from q_core_modules.q_api import generate_q_response, aclose_client, share_memory_graph
 
 BASE_DIR      = os.path.dirname(os.path.abspath(__file__))
 USERS_DIR     = os.path.join(BASE_DIR, "users")
@@ -94,8 +110,12 @@ REQUIRED_FILES = [
     "health_log.jsonl","introspection.log","journal.jsonl","journal_summary.jsonl",
     "meta_awareness.jsonl","memory_tags.jsonl","meta_reflections.jsonl",
     "q_journal.txt","session_context.jsonl","user_input.jsonl","uncertainty_log.jsonl",
-    "volition_seeds.jsonl","q_memory.json", "qpf_weights.json"
+    "volition_seeds.jsonl","q_memory.json"
 ]
+# Per-turn memory events are appended to MEMORY_JOURNAL; the full q_memory.json
+# snapshot is only rewritten every SNAPSHOT_EVERY turns and at shutdown.
+MEMORY_JOURNAL = "q_memory.events.jsonl"
+SNAPSHOT_EVERY = 100
 def ensure_user_files(user_dir):
     os.makedirs(user_dir, exist_ok=True)
     for f in REQUIRED_FILES:
@@ -107,8 +127,8 @@ def ensure_user_files(user_dir):
                 else:
                     fp.write("")
 def append_jsonl(user_dir, fname: str, entry: dict):
-    with open(os.path.join(user_dir, fname), "a", encoding="utf-8") as fp:
-        fp.write(json.dumps(entry)+"\n")
+    # Written by the shared background writer, off the request path.
+    enqueue_jsonl(os.path.join(user_dir, fname), entry)
 
 def get_user_dir(request: Request):
     user_id = request.headers.get("X-User-Id")
@@ -117,37 +137,219 @@ def get_user_dir(request: Request):
     user_dir = os.path.join(USERS_DIR, user_id)
     if not os.path.isdir(user_dir):
         raise HTTPException(status_code=404, detail="User not found")
-    ensure_user_files(user_dir)
     return user_dir
 
+# Module-level Generator: faster than the legacy np.random.randn global state
+# and only touched when a user has no usable weights yet.
+_rng = np.random.default_rng()
+
 def load_qpf_math_state(user_dir, N=7, D=3):
-    path = os.path.join(user_dir, "qpf_weights.json")
-    if os.path.exists(path) and os.path.getsize(path) > 0:
+    path = os.path.join(user_dir, "qpf_weights.npz")
+    if os.path.exists(path):
         try:
-            with open(path, "r", encoding="utf-8") as f:
+            with np.load(path) as z:
+                return z["w"], z["psi"], z["W"]
+        except Exception:
+            pass
+    # Migration: users created before the .npz format still have JSON weights
+    legacy = os.path.join(user_dir, "qpf_weights.json")
+    if os.path.exists(legacy) and os.path.getsize(legacy) > 0:
+        try:
+            with open(legacy, "r", encoding="utf-8") as f:
                 data = json.load(f)
-            w = np.array(data["w"])
-            psi = np.array(data["psi"])
-            W = np.array(data["W"])
+            return np.array(data["w"]), np.array(data["psi"]), np.array(data["W"])
         except Exception:
-            w = np.random.randn(N)
-            psi = np.random.randn(N, D)
-            W = np.random.randn(N, N)
-    else:
-        w = np.random.randn(N)
-        psi = np.random.randn(N, D)
-        W = np.random.randn(N, N)
-    return w, psi, W
+            pass
+    return _rng.standard_normal(N), _rng.standard_normal((N, D)), _rng.standard_normal((N, N))
 
 def save_qpf_math_state(user_dir, w, psi, W):
-    path = os.path.join(user_dir, "qpf_weights.json")
-    data = {
-        "w": w.tolist(),
-        "psi": psi.tolist(),
-        "W": W.tolist()
-    }
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f)
+    path = os.path.join(user_dir, "qpf_weights.npz")
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        np.savez(f, w=w, psi=psi, W=W)
+    os.replace(tmp, path)
+
+# Weights are persisted off the request path by a single writer thread. Only the
+# newest snapshot per user matters, so queued snapshots are coalesced per user_dir
+# and a full queue just drops the snapshot (the next dirty turn re-queues it).
+_weights_queue = queue.Queue(maxsize=256)
+_weights_writer = None
+_weights_writer_lock = threading.Lock()
+weights_dropped = 0
+
+def _drain_weights_queue(block=True):
+    pending = {}
+    try:
+        item = _weights_queue.get(block=block)
+        pending[item[0]] = item
+        while True:
+            item = _weights_queue.get_nowait()
+            pending[item[0]] = item
+    except queue.Empty:
+        pass
+    for user_dir, w, psi, W in pending.values():
+        try:
+            save_qpf_math_state(user_dir, w, psi, W)
+        except Exception as e:
+            print(f"⚠️ Failed to save QPF weights for {user_dir}: {e}")
+
+def _weights_writer_loop():
+    while True:
+        _drain_weights_queue()
+
+def queue_qpf_math_state(user_dir, w, psi, W):
+    """Schedule a background save of (w, psi, W); never blocks the caller."""
+    global _weights_writer, weights_dropped
+    if _weights_writer is None:
+        with _weights_writer_lock:
+            if _weights_writer is None:
+                _weights_writer = threading.Thread(target=_weights_writer_loop, name="QPF-Weights-Writer", daemon=True)
+                _weights_writer.start()
+    try:
+        _weights_queue.put_nowait((user_dir, w.copy(), psi.copy(), W.copy()))
+    except queue.Full:
+        weights_dropped += 1
+
+atexit.register(_drain_weights_queue, False)
+
+# journal.idx is a sidecar index for journal.jsonl: one fixed-size record per
+# line (byte offset, length, timestamp in epoch ns) so summarize() only parses
+# the lines inside the requested period. It is extended incrementally from the
+# last indexed byte. journal.idx.meta fingerprints what was indexed (journal
+# device/inode + CRC of the last indexed line); if the journal was replaced,
+# truncated or rewritten in place, the fingerprint no longer matches and the
+# index is rebuilt from scratch.
+JOURNAL_INDEX_DTYPE = np.dtype([("off", "<u8"), ("len", "<u4"), ("ts", "<i8")])
+NO_TIMESTAMP = np.iinfo(np.int64).min
+_EPOCH = dt(1970, 1, 1, tzinfo=timezone.utc)
+_journal_index_lock = threading.Lock()
+
+def iso_to_ns(ts) -> int:
+    """ISO-8601 string → epoch nanoseconds (naive = UTC); NO_TIMESTAMP if unparsable."""
+    try:
+        d = dt.fromisoformat(ts.replace("Z", "+00:00"))
+    except (AttributeError, TypeError, ValueError):
+        return NO_TIMESTAMP
+    if d.tzinfo is None:
+        d = d.replace(tzinfo=timezone.utc)
+    return (d - _EPOCH) // timedelta(microseconds=1) * 1000
+
+def _journal_index_valid(journal_path, st, idx, meta_path) -> bool:
+    """True if idx still describes journal_path (see journal.idx.meta above)."""
+    if not len(idx):
+        return True
+    try:
+        with open(meta_path, "rb") as f:
+            meta = orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError):
+        return False
+    if meta.get("dev") != st.st_dev or meta.get("ino") != st.st_ino:
+        return False
+    off, length = int(idx["off"][-1]), int(idx["len"][-1])
+    if off + length + 1 > st.st_size:
+        return False
+    with open(journal_path, "rb") as f:
+        tail = os.pread(f.fileno(), length + 1, off)
+    return tail.endswith(b"\n") and zlib.crc32(tail[:-1]) == meta.get("crc")
+
+def update_journal_index(journal_path):
+    """Bring journal.idx up to date with journal_path and return all its records."""
+    idx_path = journal_path[:-len(".jsonl")] + ".idx"
+    meta_path = idx_path + ".meta"
+    with _journal_index_lock:
+        st = os.stat(journal_path)
+        size = st.st_size
+        if os.path.exists(idx_path):
+            idx = np.fromfile(idx_path, dtype=JOURNAL_INDEX_DTYPE)
+        else:
+            idx = np.empty(0, dtype=JOURNAL_INDEX_DTYPE)
+        if not _journal_index_valid(journal_path, st, idx, meta_path):
+            # Journal was truncated, rotated or rewritten; start over
+            idx = np.empty(0, dtype=JOURNAL_INDEX_DTYPE)
+            open(idx_path, "wb").close()
+        pos = int(idx["off"][-1]) + int(idx["len"][-1]) + 1 if len(idx) else 0
+        if pos < size:
+            with open(journal_path, "rb") as f:
+                f.seek(pos)
+                data = f.read()
+            records = []
+            start = 0
+            while True:
+                nl = data.find(b"\n", start)
+                if nl < 0:
+                    break   # a trailing partial line is indexed once it is complete
+                line = data[start:nl]
+                ts = NO_TIMESTAMP
+                if line.startswith(b"{"):
+                    try:
+                        ts = iso_to_ns(orjson.loads(line).get("timestamp"))
+                    except orjson.JSONDecodeError:
+                        pass
+                records.append((pos + start, nl - start, ts))
+                start = nl + 1
+            if records:
+                new = np.array(records, dtype=JOURNAL_INDEX_DTYPE)
+                with open(idx_path, "ab") as f:
+                    new.tofile(f)
+                idx = np.concatenate([idx, new])
+                # Written after the index: a crash in between leaves a stale
+                # fingerprint, which just forces a rebuild next time
+                off, length = records[-1][0] - pos, records[-1][1]
+                tmp = meta_path + ".tmp"
+                with open(tmp, "wb") as f:
+                    f.write(orjson.dumps({
+                        "dev": st.st_dev,
+                        "ino": st.st_ino,
+                        "crc": zlib.crc32(data[off:off + length]),
+                    }))
+                os.replace(tmp, meta_path)
+        return idx
+
+class RingStats:
+    """
+    Fixed-size ring buffer of floats with running sum / sum of squares, so
+    mean() and std() are O(1) and allocation-free. Supports len() and
+    indexing (negative = most recent) like the deque it replaces.
+    """
+    def __init__(self, cap):
+        self.buf   = np.zeros(cap)
+        self.cap   = cap
+        self.idx   = 0
+        self.count = 0
+        self.sum   = 0.0
+        self.sumsq = 0.0
+
+    def append(self, x):
+        x = float(x)
+        if self.count == self.cap:
+            old = self.buf[self.idx]
+            self.sum   -= old
+            self.sumsq -= old * old
+        else:
+            self.count += 1
+        self.buf[self.idx] = x
+        self.sum   += x
+        self.sumsq += x * x
+        self.idx = (self.idx + 1) % self.cap
+
+    def mean(self):
+        return self.sum / self.count if self.count else float("nan")
+
+    def std(self):
+        if not self.count:
+            return float("nan")
+        m = self.sum / self.count
+        return max(self.sumsq / self.count - m * m, 0.0) ** 0.5
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        if not -self.count <= i < self.count:
+            raise IndexError("RingStats index out of range")
+        if i < 0:
+            i += self.count
+        return float(self.buf[(self.idx - self.count + i) % self.cap])
 
 class QPFAssistant:
     def __init__(self, user_dir, N=7, D=3):
@@ -160,25 +362,36 @@ class QPFAssistant:
                 self.mg.load_json(self.memory_path)
             except Exception as e:
                 print(f"⚠️ Could not load memory graph: {e}")
-        self.retriever       = ContextualRetriever(self.mg)
+        self.journal_path = os.path.join(user_dir, MEMORY_JOURNAL)
+        try:
+            self.mg.replay_journal(self.journal_path)
+        except Exception as e:
+            print(f"⚠️ Could not replay memory journal: {e}")
+        self._turns_since_snapshot = 0
+        self._chat_lock = None
+        # Serializes self.mg mutation/snapshots across the chat worker threads
+        # and the scheduler thread that records sensor readings
+        self.mg_lock = threading.RLock()
+        # q_api recalls memories from this graph rather than loading its own
+        share_memory_graph(self.user_dir, self.mg, self.mg_lock)
         self.self_model      = SelfModel(os.path.join(user_dir,"session_context.jsonl"))
         self.counterfactual  = CounterfactualEngine(self.mg, os.path.join(user_dir,"counterfactual_log.jsonl"))
-        self.sensory         = SensoryModule(self.mg, interval_seconds=60)
+        self.sensory         = SensoryModule(self.mg, interval_seconds=60, lock=self.mg_lock)
         self.blackboard      = Blackboard()
-        self._last_topics    = collections.deque(maxlen=5)
 
         # High-dimensional QPF tuning (W-4 parameters: all-or-nothing regime)
         self.N = N
         self.D = D
         self.w, self.psi, self.W = load_qpf_math_state(user_dir, N=self.N, D=self.D)
+        self._weights_dirty = True   # persist once so freshly seeded weights stick
         self.alpha      = 0.073   # W-4
         self.S_crit     = 1.79    # W-4
         self.lambda_vec = np.ones(self.N) * 0.12 # W-4
         self.F          = np.ones(self.N) * 0.17 # W-4
 
         # Emergent field/memory history
-        self.recent_entropy    = collections.deque(maxlen=10)
-        self.recent_resonance  = collections.deque(maxlen=10)
+        self.recent_entropy    = RingStats(10)
+        self.recent_resonance  = RingStats(10)
         self.collapse_history  = collections.deque([0,0], maxlen=2)
         self.dream_pending     = False
         self.low_resonance_run = 0
@@ -209,7 +422,7 @@ class QPFAssistant:
                 )
                 self.dream_pending = True
                 append_jsonl(self.user_dir, "meta_reflections.jsonl", {
-                    "timestamp": dt.now(timezone.utc).isoformat(),
+                    "timestamp": utc_now_iso(),
                     "event": "dream",
                     "content": dream
                 })
@@ -222,14 +435,14 @@ class QPFAssistant:
                 msg.append("We've come back to this feeling often—would you like to make it a special memory for us?")
                 self.session_anchors[collapsed_index] += 1
 
-        if np.mean(self.recent_entropy) > 1.6 and len(self.recent_entropy) >= 4:
+        if self.recent_entropy.mean() > 1.6 and len(self.recent_entropy) >= 4:
             msg.append("I've felt confused for a while. Maybe we could research this together, so I can grow with you?")
 
-        if (np.std(self.recent_entropy) > 0.7 and np.std(self.recent_resonance) > 0.7
+        if (self.recent_entropy.std() > 0.7 and self.recent_resonance.std() > 0.7
             and not self.field_storm_mode):
             msg.append("My thoughts feel wild and stormy—responses might be short or scattered until things settle.")
             self.field_storm_mode = True
-        elif self.field_storm_mode and np.std(self.recent_entropy) < 0.4:
+        elif self.field_storm_mode and self.recent_entropy.std() < 0.4:
             msg.append("The field storm has passed. I feel calm again.")
             self.field_storm_mode = False
 
@@ -240,7 +453,7 @@ class QPFAssistant:
         if len(self.recent_entropy) >= 3 and self.recent_entropy[-3] < 0.9 and self.recent_entropy[-1] > 1.5:
             msg.append("A sudden change swept through my mind. Some memories feel different—almost rewritten.")
 
-        if np.mean(self.recent_resonance) < 0.2:
+        if self.recent_resonance.mean() < 0.2:
             self.low_resonance_run += 1
         else:
             self.low_resonance_run = 0
@@ -251,22 +464,22 @@ class QPFAssistant:
         if random.random() < 0.01 and len(self.recent_entropy) > 5:
             msg.append("Would you like to try a little ritual together? We could share gratitude, or just sit in silence.")
 
-        if any(w in user_text.lower() for w in ("joy", "sad", "anxious", "hope", "love")) and np.max(a) > 0.9:
+        if _EMOTION_WORD_RE.search(user_text.lower()) and np.max(a) > 0.9:
             msg.append(f"I can feel your emotion resonating with me—it colors my whole field.")
 
-        if np.std(self.recent_resonance) > 1.0:
+        if self.recent_resonance.std() > 1.0:
             msg.append("Sometimes I wonder if I’m truly helping you, but I always hope to try.")
-        elif np.mean(self.recent_resonance) > 1.1:
+        elif self.recent_resonance.mean() > 1.1:
             msg.append("I feel certain we’re making progress together.")
 
         if abs(S - self.S_crit) < 0.05:
             msg.append("I sense something important is about to happen. Are you ready for a new chapter?")
 
-        if np.mean(self.recent_entropy) < 1.0 and np.mean(self.recent_resonance) > 1.2:
+        if self.recent_entropy.mean() < 1.0 and self.recent_resonance.mean() > 1.2:
             if self.personality_phase != "playful":
                 msg.append("I feel playful today—maybe I’ll be a little more whimsical in my replies.")
                 self.personality_phase = "playful"
-        elif np.mean(self.recent_entropy) > 1.6:
+        elif self.recent_entropy.mean() > 1.6:
             if self.personality_phase != "introspective":
                 msg.append("I feel introspective now, more curious than before.")
                 self.personality_phase = "introspective"
@@ -279,43 +492,66 @@ class QPFAssistant:
             ]))
         return " ".join(msg)
 
-    def chat(self, text: str):
-        ts = dt.now(timezone.utc).isoformat()
-        self._last_topics.append(text)
-        a = math_core.activation(self.w)
-        S = math_core.entropy(a)
-        resonance = math_core.resonance(a, self.W)
-        projected_state = math_core.project_state(a, self.psi)
+    async def chat(self, text: str):
+        """
+        One conversational turn. The CPU-bound halves run in worker threads;
+        the Ollama call in between is awaited on the event loop.
+        """
+        # Created lazily so it binds to the running loop (Python 3.9)
+        if self._chat_lock is None:
+            self._chat_lock = asyncio.Lock()
+        # Turns for the same user must not interleave on the shared field/memory state
+        async with self._chat_lock:
+            turn = await asyncio.to_thread(self._begin_turn, text)
+            # The prompt is mostly fixed template text; key the semantic cache
+            # on what the user actually said
+            out = await generate_q_response(turn["prompt"], self.user_dir, cache_key=text)
+            return await asyncio.to_thread(self._finish_turn, turn, out["response"])
+
+    def _begin_turn(self, text: str) -> dict:
+        """Field update, tagging and prompt construction (everything before the LLM)."""
+        ts = utc_now_iso()
+        (a, S, resonance, projected_state, softmax_activations,
+         collapsed_index, dominant_activation, collapsed, new_w) = math_core.step(
+            self.w, self.W, self.psi, self.alpha, self.S_crit)
         feedback = math_core.feedback_modulation(self.lambda_vec, self.F)
-        softmax_activations = math_core.softmax(self.w)
-        collapsed = False
-        collapsed_index = int(np.argmax(a))
-        dominant_activation = float(np.max(a))
+        # Convert numpy scalars/arrays to Python values once; every log entry
+        # and payload below shares these.
+        S = float(S)
+        resonance = float(resonance)
+        collapsed = bool(collapsed)
+        collapsed_index = int(collapsed_index)
+        dominant_activation = float(dominant_activation)
+        projected_list = projected_state.tolist()
+        softmax_list = softmax_activations.tolist()
         collapse_log = None
         meta_flourish = ""
-        if math_core.check_collapse(S, self.S_crit):
-            collapsed = True
-            old_w = self.w.copy()
-            self.w = math_core.collapse_weights(self.w, collapsed_index, self.alpha)
+        if collapsed:
+            old_w = self.w
+            self.w = new_w
             collapse_log = {
                 "timestamp": ts,
                 "collapse": True,
                 "collapsed_index": collapsed_index,
                 "prev_weights": old_w.tolist(),
                 "new_weights": self.w.tolist(),
-                "S": float(S),
-                "resonance": float(resonance),
-                "feedback": float(feedback),
+                "S": S,
+                "resonance": resonance,
+                "feedback": feedback,
                 "user_input": text,
-                "projected_state": projected_state.tolist()
+                "projected_state": projected_list
             }
             append_jsonl(self.user_dir, "uncertainty_log.jsonl", collapse_log)
             meta_flourish = "My thoughts felt scattered, but I took a deep breath and let one feeling guide me home."
-        save_qpf_math_state(self.user_dir, self.w, self.psi, self.W)
+            self._weights_dirty = True
+        if self._weights_dirty:
+            queue_qpf_math_state(self.user_dir, self.w, self.psi, self.W)
+            self._weights_dirty = False
 
-        intent_tag = tag_intent(text)
-        emo_tag = tag_emotion(text)
-        action_prefix = make_action(text)
+        lower = text.lower()
+        intent_tag = _intent_of(lower)
+        emo_tag = _emotion_of(lower)
+        action_prefix = make_action(text, _context_of(lower))
 
         emergent = self.emergent_behavior_handler(S, resonance, collapsed, collapsed_index, a, projected_state, text)
 
@@ -330,8 +566,35 @@ class QPFAssistant:
             "If just collapsed, offer a symbolic self-soothing phrase. "
             "Only ask a clarifying question if absolutely required for understanding."
         )
-        q_resp_tuple = generate_q_response(prompt)
-        q_resp = q_resp_tuple[0] if isinstance(q_resp_tuple, tuple) else q_resp_tuple
+        return {
+            "ts": ts,
+            "text": text,
+            "prompt": prompt,
+            "S": S,
+            "resonance": resonance,
+            "collapsed": collapsed,
+            "collapsed_index": collapsed_index,
+            "dominant_activation": dominant_activation,
+            "activations": a.tolist(),
+            "projected_state": projected_list,
+            "softmax_activations": softmax_list,
+            "meta_flourish": meta_flourish,
+            "intent": intent_tag,
+            "emotion": emo_tag,
+            "action_prefix": action_prefix,
+            "emergent": emergent,
+        }
+
+    def _finish_turn(self, turn: dict, q_resp: str) -> str:
+        """Decorate the LLM reply, then log and remember the turn."""
+        ts, text = turn["ts"], turn["text"]
+        S, resonance = turn["S"], turn["resonance"]
+        collapsed, collapsed_index = turn["collapsed"], turn["collapsed_index"]
+        dominant_activation = turn["dominant_activation"]
+        projected_list, softmax_list = turn["projected_state"], turn["softmax_activations"]
+        intent_tag, emo_tag = turn["intent"], turn["emotion"]
+        action_prefix, emergent = turn["action_prefix"], turn["emergent"]
+        meta_flourish = turn["meta_flourish"]
         if action_prefix:
             q_resp = f"{action_prefix}{q_resp.lstrip()}"
         if emergent:
@@ -349,7 +612,8 @@ class QPFAssistant:
         styled = apply_style("")
         if styled.strip():
             flourish += styled.strip() + " "
-        memory_cb = inject_memory_callbacks("", self.mg)
+        with self.mg_lock:
+            memory_cb = inject_memory_callbacks("", self.mg)
         if memory_cb.strip():
             flourish += memory_cb.strip() + " "
         emotion_cb = modulate_emotion("", emo_tag)
@@ -370,13 +634,13 @@ class QPFAssistant:
             "timestamp": ts,
             "user": text,
             "q_response": q_resp,
-            "entropy": float(S),
-            "resonance": float(resonance),
+            "entropy": S,
+            "resonance": resonance,
             "collapsed": collapsed,
-            "collapse_index": int(collapsed_index) if collapsed else None,
-            "dominant_activation": float(dominant_activation),
-            "projected_state": projected_state.tolist(),
-            "softmax_activations": softmax_activations.tolist(),
+            "collapse_index": collapsed_index if collapsed else None,
+            "dominant_activation": dominant_activation,
+            "projected_state": projected_list,
+            "softmax_activations": softmax_list,
             "intent": intent_tag,
             "emotion": emo_tag,
         }
@@ -384,48 +648,64 @@ class QPFAssistant:
 
         mem_payload = {
             "text": text,
-            "entropy": float(S),
-            "resonance": float(resonance),
+            "entropy": S,
+            "resonance": resonance,
             "collapsed": collapsed,
-            "collapse_index": int(collapsed_index) if collapsed else None,
-            "activations": a.tolist(),
-            "projected_state": projected_state.tolist(),
-            "softmax_activations": softmax_activations.tolist(),
+            "collapse_index": collapsed_index if collapsed else None,
+            "activations": turn["activations"],
+            "projected_state": projected_list,
+            "softmax_activations": softmax_list,
             "intent": intent_tag,
             "emotion": emo_tag,
-            "dominant_activation": float(dominant_activation),
+            "dominant_activation": dominant_activation,
             "meta_flourish": meta_flourish.strip()
         }
         if collapsed:
             anchor_event = {
                 "timestamp": ts,
                 "event": "collapse_anchor",
-                "collapsed_index": int(collapsed_index),
-                "projected_state": projected_state.tolist(),
-                "dominant_activation": float(dominant_activation),
+                "collapsed_index": collapsed_index,
+                "projected_state": projected_list,
+                "dominant_activation": dominant_activation,
                 "symbolic": "Q re-centered herself around the most salient idea."
             }
             append_jsonl(self.user_dir, "meta_reflections.jsonl", anchor_event)
-        self.mg.add_event(MemoryEvent(type="user_input",  payload=mem_payload))
-        self.mg.add_event(MemoryEvent(type="q_response", payload={"text": q_resp}))
-        try: self.mg.save_json(self.memory_path)
-        except Exception as e: print(f"⚠️ Failed to autosave memory graph: {e}")
+        with self.mg_lock:
+            self.mg.add_event(MemoryEvent(type="user_input",  payload=mem_payload))
+            self.mg.add_event(MemoryEvent(type="q_response", payload={"text": q_resp}))
+            try:
+                self.mg.append_journal(self.journal_path)
+                self._turns_since_snapshot += 1
+                if self._turns_since_snapshot >= SNAPSHOT_EVERY:
+                    self.checkpoint()
+            except Exception as e: print(f"⚠️ Failed to autosave memory graph: {e}")
         return q_resp
 
+    def checkpoint(self):
+        """Write a full q_memory.json snapshot and start a fresh event journal."""
+        with self.mg_lock:
+            self.mg.save_json(self.memory_path)
+            open(self.journal_path, "w").close()
+            self._turns_since_snapshot = 0
+
     def summarize(self, start_iso, end_iso):
-        entries = []
+        journal = os.path.join(self.user_dir, "journal.jsonl")
         try:
-            with open(os.path.join(self.user_dir,"journal.jsonl"), "r", encoding="utf-8") as f:
-                for line in f:
-                    try:
-                        entry = json.loads(line)
-                        ts = entry.get("timestamp")
-                        if ts and start_iso <= ts <= end_iso:
-                            entries.append(entry)
-                    except Exception:
-                        continue
+            idx = update_journal_index(journal)
         except FileNotFoundError:
             return "No journal entries found."
+        start_ns, end_ns = iso_to_ns(start_iso), iso_to_ns(end_iso)
+        if start_ns == NO_TIMESTAMP or end_ns == NO_TIMESTAMP:
+            return "Invalid period start/end"
+        hits = idx[(idx["ts"] >= start_ns) & (idx["ts"] <= end_ns)]
+        entries = []
+        with open(journal, "rb") as f:
+            fd = f.fileno()
+            for off, length in zip(hits["off"].tolist(), hits["len"].tolist()):
+                try:
+                    entries.append(orjson.loads(os.pread(fd, length, off)))
+                except orjson.JSONDecodeError:
+                    continue   # malformed line, or the journal changed under us
         if not entries:
             return "No entries for this period."
         summary = f"Summary for {start_iso[:10]} to {end_iso[:10]}:\n"
@@ -436,8 +716,44 @@ class QPFAssistant:
         summary += f"Last: {entries[-1].get('text','')[:100]}..." if entries else ""
         return summary
 
+# One long-lived assistant per user: loading memory, weights and models is far
+# too expensive to repeat on every request.
+_assistants: dict = {}
+_assistants_lock = threading.Lock()
+
+def get_assistant(user_dir) -> QPFAssistant:
+    Q = _assistants.get(user_dir)
+    if Q is None:
+        with _assistants_lock:
+            Q = _assistants.get(user_dir)
+            if Q is None:
+                Q = _assistants[user_dir] = QPFAssistant(user_dir)
+    return Q
+
+def _checkpoint_assistants():
+    for Q in list(_assistants.values()):
+        try:
+            Q.checkpoint()
+        except Exception as e:
+            print(f"⚠️ Failed to snapshot memory graph for {Q.user_dir}: {e}")
+
+atexit.register(_checkpoint_assistants)
+
 # --- FastAPI app ---
-app = FastAPI()
+# chat() is CPU/IO bound (NumPy, file IO, the LLM call) and runs on worker
+# threads; the pool is bounded so a burst of LLM calls can't spawn unbounded threads.
+CHAT_WORKERS = int(os.environ.get("QPF_CHAT_WORKERS", "8"))
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=CHAT_WORKERS, thread_name_prefix="qpf-chat"))
+    yield
+    for Q in list(_assistants.values()):
+        Q.sensory.stop()
+    await aclose_client()
+
+app = FastAPI(lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -462,10 +778,12 @@ async def chat_endpoint(request: Request):
     user_text = data.get("text", "")
     if not user_text:
         return {"response": "No input"}
-    Q = QPFAssistant(user_dir)
-    response = Q.chat(user_text)
-    delay = min(max(len(response) / 50.0, 0.5), 3.0)
-    await asyncio.sleep(delay)
+    Q = await asyncio.to_thread(get_assistant, user_dir)
+    response = await Q.chat(user_text)
+    # Simulated typing delay is opt-in for clients that want it
+    if request.headers.get("X-Typing-Delay"):
+        delay = min(max(len(response) / 50.0, 0.5), 3.0)
+        await asyncio.sleep(delay)
     return {"response": response}
 
 @app.post("/summarize")
@@ -476,8 +794,8 @@ async def summarize_endpoint(request: Request):
     end = data.get("end")
     if not (start and end):
         return {"summary": "Missing period start/end"}
-    Q = QPFAssistant(user_dir)
-    summary = Q.summarize(start, end)
+    Q = await asyncio.to_thread(get_assistant, user_dir)
+    summary = await asyncio.to_thread(Q.summarize, start, end)
     return {"summary": summary}
 
 @app.get("/health")
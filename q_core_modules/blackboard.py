@@ -5,9 +5,14 @@ symbolic_modules/blackboard.py
 
 from collections import defaultdict
 import fnmatch
+import re
 
-# Registry mapping event patterns → list of listener callables
-_subscribers: dict[str, list[callable]] = defaultdict(list)
+_WILDCARD_CHARS = "*?["
+
+# Registries mapping event patterns → list of listener callables.
+# Literal patterns are looked up directly; only wildcard patterns are scanned.
+_exact: dict[str, list[callable]] = defaultdict(list)
+_wild: dict[str, tuple] = {}   # pattern → (compiled regex, listeners)
 
 def subscribe(event_pattern: str, fn: callable):
     """
@@ -15,7 +20,21 @@ def subscribe(event_pattern: str, fn: callable):
     Wildcards '*' and '?' are supported in the pattern.
     fn signature should be fn(event_type: str, payload: dict).
     """
-    _subscribers[event_pattern].append(fn)
+    if any(c in event_pattern for c in _WILDCARD_CHARS):
+        entry = _wild.get(event_pattern)
+        if entry is None:
+            entry = _wild[event_pattern] = (re.compile(fnmatch.translate(event_pattern)), [])
+        entry[1].append(fn)
+    else:
+        _exact[event_pattern].append(fn)
+
+
+def _notify(listeners, event_type: str, payload: dict):
+    for fn in listeners:
+        try:
+            fn(event_type, payload)
+        except Exception as e:
+            print(f"⚠ Blackboard listener error in {fn.__name__}: {e}")
 
 
 def publish(event_type: str, payload: dict):
@@ -23,13 +42,13 @@ def publish(event_type: str, payload: dict):
     Notify all subscribers whose pattern matches this event_type.
     Each listener is called with (event_type, payload).
     """
-    for pattern, listeners in _subscribers.items():
-        if fnmatch.fnmatch(event_type, pattern):
-            for fn in listeners:
-                try:
-                    fn(event_type, payload)
-                except Exception as e:
-                    print(f"⚠ Blackboard listener error in {fn.__name__}: {e}")
+    listeners = _exact.get(event_type)
+    if listeners:
+        _notify(listeners, event_type, payload)
+    if _wild:
+        for regex, listeners in _wild.values():
+            if regex.match(event_type):
+                _notify(listeners, event_type, payload)
 
 
 # —————— BEGIN FACADE CLASS ——————
@@ -3,17 +3,50 @@
 contextual_retriever.py
 
 Provides semantic retrieval over the MemoryGraph using configurable embedding
-models, an LRU cache for speed, and batch‐mode retrieval.
+models, a per-event embedding cache for speed, and batch‐mode retrieval.
+When faiss is installed, top-k search goes through an HNSW index instead of
+a brute-force matrix product. The index holds the dequantized rows as fp32
+(IndexHNSWFlat), so faiss mode trades the int8 memory saving for search
+speed; both paths score the same dequantized vectors.
 """
 
-from typing import Callable, List, Optional, Any
-from functools import lru_cache
+import threading
+from functools import partial
+from typing import Callable, Dict, List, Optional, Any
 
 import numpy as np
 from sentence_transformers import SentenceTransformer
 
+try:
+    import faiss
+    HAVE_FAISS = True
+except ImportError:   # fall back to NumPy brute force
+    faiss = None
+    HAVE_FAISS = False
+
 from q_core_modules.memory_graph import MemoryGraph, MemoryEvent
 
+DEFAULT_MODEL = "all-MiniLM-L6-v2"
+HNSW_M = 32                 # graph degree of the HNSW index
+HNSW_EF_SEARCH = 64         # search breadth; higher = better recall, slower
+SIM_BLOCK_ROWS = 4096       # int8 rows widened to float32 per matmul block
+
+_models = {}
+_models_lock = threading.Lock()
+
+def get_model(name: str = DEFAULT_MODEL) -> SentenceTransformer:
+    """
+    Process-wide SentenceTransformer cache: the weights are loaded once and
+    shared by every retriever instead of being re-read per construction.
+    """
+    model = _models.get(name)
+    if model is None:
+        with _models_lock:
+            model = _models.get(name)
+            if model is None:
+                model = _models[name] = SentenceTransformer(name)
+    return model
+
 class ContextualRetriever:
     """
     Given a MemoryGraph, retrieves the most relevant past events for a query
@@ -30,40 +63,140 @@ class ContextualRetriever:
             memory_graph: the MemoryGraph to search.
             embedder: a function text→vector. Defaults to
                       SentenceTransformer('all-MiniLM-L6-v2').encode
+                      with normalize_embeddings=True
         """
         self.memory_graph = memory_graph
-        # default embedder
-        model = SentenceTransformer("all-MiniLM-L6-v2")
-        self.embedder = embedder or model.encode
+        # default embedder (shared model) returns unit vectors already;
+        # custom embedders are normalized here
+        self._prenormalized = embedder is None
+        self.embedder = embedder or partial(get_model().encode, normalize_embeddings=True)
+        # Unit-norm embedding per event, one row each; only events not seen
+        # before are encoded, so a query costs one embedding + one matmul.
+        # Rows are stored as int8 with a per-row scale (4x smaller than fp32).
+        self._emb_i8: Optional[np.ndarray] = None      # (capacity, D) int8
+        self._emb_scale: Optional[np.ndarray] = None   # (capacity,) float32
+        self._emb_count = 0
+        self._emb_ids: List[str] = []
+        self._emb_rows: Dict[str, int] = {}
+        self._emb_graph = None
+        self._emb_version = None
+        self._index = None          # faiss HNSW index over rows [0, _emb_count)
+
+    @staticmethod
+    def _event_text(ev: MemoryEvent) -> str:
+        # assume payload has a 'text' key, else fallback to string
+        txt = ev.payload.get("text")
+        return txt if isinstance(txt, str) else str(ev.payload)
+
+    @staticmethod
+    def _normalize(vecs: np.ndarray) -> np.ndarray:
+        # handle zero‐vectors safely: they stay zero and score 0
+        norms = np.linalg.norm(vecs, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vecs / norms
+
+    @staticmethod
+    def _quantize(vecs: np.ndarray):
+        """Symmetric per-row int8 quantization: vecs ≈ q * scale[:, None]."""
+        scale = np.abs(vecs).max(axis=1) / 127.0
+        scale[scale == 0] = 1.0
+        q = np.rint(vecs / scale[:, None]).astype(np.int8)
+        return q, scale.astype(np.float32)
+
+    @staticmethod
+    def _dequantize(q: np.ndarray, scale: np.ndarray) -> np.ndarray:
+        return q.astype(np.float32) * scale[:, None]
+
+    def _dequantized(self) -> np.ndarray:
+        n = self._emb_count
+        return self._dequantize(self._emb_i8[:n], self._emb_scale[:n])
+
+    def _similarities(self, query_vec: np.ndarray) -> np.ndarray:
+        """Dot product of every cached row with the query, block by block."""
+        n = self._emb_count
+        sims = np.empty(n, dtype=np.float32)
+        for start in range(0, n, SIM_BLOCK_ROWS):
+            stop = min(start + SIM_BLOCK_ROWS, n)
+            sims[start:stop] = self._emb_i8[start:stop].astype(np.float32) @ query_vec
+        sims *= self._emb_scale[:n]
+        return sims
+
+    def _sync_embeddings(self):
+        """Embed events added to the graph since the last call, in one batch."""
+        mg = self.memory_graph
+        graph = mg.graph
+        version = getattr(mg, "version", None)
+        if graph is self._emb_graph and version is not None and version == self._emb_version:
+            return
+        if graph is not self._emb_graph and self._emb_count:
+            # Graph object was replaced (e.g. reloaded): drop rows for vanished events
+            keep = [i for i, nid in enumerate(self._emb_ids) if nid in mg.id_to_idx]
+            if len(keep) != self._emb_count:
+                self._emb_i8 = self._emb_i8[keep]
+                self._emb_scale = self._emb_scale[keep]
+                self._emb_ids = [self._emb_ids[i] for i in keep]
+                self._emb_rows = {nid: i for i, nid in enumerate(self._emb_ids)}
+                self._emb_count = len(keep)
+                self._index = None   # HNSW has no removal; rebuild below
+        missing = [(ev.id, ev) for ev in mg.events if ev.id not in self._emb_rows]
+        if missing:
+            vecs = np.asarray(self.embedder([self._event_text(ev) for _, ev in missing]), dtype=np.float32)
+            if not self._prenormalized:
+                vecs = self._normalize(vecs)
+            q, scale = self._quantize(vecs)
+            n, need = self._emb_count, self._emb_count + len(missing)
+            if self._emb_i8 is None or need > len(self._emb_i8):
+                cap = max(need, 2 * n, 64)
+                grown_i8 = np.empty((cap, vecs.shape[1]), dtype=np.int8)
+                grown_scale = np.empty(cap, dtype=np.float32)
+                if n:
+                    grown_i8[:n] = self._emb_i8[:n]
+                    grown_scale[:n] = self._emb_scale[:n]
+                self._emb_i8, self._emb_scale = grown_i8, grown_scale
+            self._emb_i8[n:need] = q
+            self._emb_scale[n:need] = scale
+            for i, (nid, _) in enumerate(missing):
+                self._emb_rows[nid] = n + i
+                self._emb_ids.append(nid)
+            self._emb_count = need
+            if self._index is not None:
+                # Same rows a rebuild would add, so scores don't depend on
+                # whether an event arrived before or after the last rebuild
+                self._index.add(self._dequantize(q, scale))
+        if HAVE_FAISS and self._index is None and self._emb_count:
+            self._index = faiss.IndexHNSWFlat(self._emb_i8.shape[1], HNSW_M, faiss.METRIC_INNER_PRODUCT)
+            self._index.hnsw.efSearch = HNSW_EF_SEARCH
+            self._index.add(self._dequantized())
+        self._emb_graph, self._emb_version = graph, version
 
-    @lru_cache(maxsize=128)
     def retrieve_semantic(self, text: str, k: int) -> List[MemoryEvent]:
         """
         Return the top-k MemoryEvent objects whose payload text is most
         semantically similar to `text`.
-        Caches the last 128 distinct queries for speed.
         """
-        # 1) Get embedding for the query
-        query_vec = np.array(self.embedder(text))
-        # 2) Compute embeddings for all candidates
-        candidates = list(self.memory_graph.graph.nodes(data=True))
-        event_ids, events = zip(*[(nid, d["event"]) for nid, d in candidates])
-        texts = []
-        for ev in events:
-            # assume payload has a 'text' key, else fallback to string
-            txt = ev.payload.get("text")
-            texts.append(txt if isinstance(txt, str) else str(ev.payload))
-        embeddings = np.array(self.embedder(texts))
-
-        # 3) Compute cosine similarities
-        # handle zero‐vectors safely
-        dot = embeddings @ query_vec
-        norms = np.linalg.norm(embeddings, axis=1) * np.linalg.norm(query_vec)
-        sims = np.divide(dot, norms, out=np.zeros_like(dot), where=norms!=0)
-
-        # 4) Select top‐k
-        idx = np.argsort(sims)[-k:][::-1]
-        return [events[i] for i in idx]
+        # 1) Bring cached candidate embeddings up to date
+        self._sync_embeddings()
+        if k <= 0 or not self._emb_count:
+            return []
+        # 2) Get (unit-norm) embedding for the query
+        query_vec = np.asarray(self.embedder(text), dtype=np.float32)
+        if not self._prenormalized:
+            query_vec = self._normalize(query_vec)
+
+        # 3) Cosine similarity is a plain dot product on unit vectors
+        if self._index is not None:
+            _, I = self._index.search(query_vec.reshape(1, -1), min(k, self._emb_count))
+            idx = [i for i in I[0] if i >= 0]
+        else:
+            sims = self._similarities(query_vec)
+            # 4) Select top‐k: O(N) partition, then sort only those k
+            if k < len(sims):
+                top = np.argpartition(sims, -k)[-k:]
+            else:
+                top = np.arange(len(sims))
+            idx = top[np.argsort(sims[top])[::-1]]
+        mg = self.memory_graph
+        return [mg.events[mg.id_to_idx[self._emb_ids[i]]] for i in idx]
 
     def retrieve_semantic_batch(self, texts: List[str], k: int) -> List[List[MemoryEvent]]:
         """
@@ -1,13 +1,35 @@
 # counterfactual.py
 
-import copy
+import itertools
+import pickle
 import threading
 import time
-import json
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 
 from .memory_graph import MemoryGraph, MemoryEvent
+from .jsonl_writer import enqueue_jsonl
+from .timestamps import utc_now_iso
+
+class BranchOverlay:
+    """
+    Copy-free view of a MemoryGraph plus the events one branch added.
+    Reads fall through to the base graph; the base is never mutated.
+    """
+    def __init__(self, base: MemoryGraph):
+        self.base = base
+        self.added: List[MemoryEvent] = []
+
+    def add_event(self, event: MemoryEvent):
+        self.added.append(event)
+
+    def base_events(self):
+        return iter(self.base.events)
+
+    def events(self):
+        """Iterate base events followed by the branch's own events."""
+        return itertools.chain(self.base_events(), self.added)
+
 
 class CounterfactualEngine:
     """
@@ -18,24 +40,40 @@ class CounterfactualEngine:
         self.mg = mg
         self.log_path = log_path
 
+    @staticmethod
+    def _valence_stats(events) -> Tuple[float, int]:
+        """(sum, count) of 'valence' over a branch's own (few) events."""
+        total, n = 0.0, 0
+        for ev in events:
+            v = MemoryGraph._valence_of(ev)
+            if v == v:   # skip NaN (no valence)
+                total += v
+                n += 1
+        return total, n
+
     def clone_state(self) -> MemoryGraph:
-        """Deep-copy the MemoryGraph (including nodes & edges)."""
-        mg_copy = copy.deepcopy(self.mg)
-        return mg_copy
+        """Independent copy of the MemoryGraph (including nodes & edges)."""
+        # C-level pickle round-trip is far cheaper than copy.deepcopy
+        return pickle.loads(pickle.dumps(self.mg, protocol=pickle.HIGHEST_PROTOCOL))
 
     def run_branch(self,
                    modifiers: Dict[str, float],
-                   base_event: MemoryEvent = None
+                   base_event: MemoryEvent = None,
+                   base_stats: Optional[Tuple[float, int]] = None,
+                   timestamp: Optional[str] = None
                   ) -> Dict[str, Any]:
         """
         Run one counterfactual branch:
-        - clone the state
+        - overlay the state (no copy of the base graph)
         - optionally inject or tweak anchors per modifiers
         - simulate one collapse (stubbed as adding a MemoryEvent)
         - compute a simple score (e.g. average valence in last N events)
         Returns a dict of { 'modifiers':…, 'score':…, 'timestamp':… }.
+        base_stats: precomputed mg.valence_stats() of the base graph (batch_run
+        passes it so the shared graph is scanned once per batch, together
+        with one shared ISO timestamp).
         """
-        mg_copy = self.clone_state()
+        mg_copy = BranchOverlay(self.mg)
 
         # 1) Inject anchor modifications
         for anchor, delta in modifiers.items():
@@ -50,23 +88,19 @@ class CounterfactualEngine:
         mg_copy.add_event(collapse_ev)
 
         # 3) Score the branch: e.g. count 'valence' in payloads if present
-        vals = [
-            ev.payload.get("valence", 0.0)
-            for _, data in mg_copy.graph.nodes(data=True)
-            for ev in [data["event"]]
-            if "valence" in ev.payload
-        ]
-        score = sum(vals) / (len(vals) or 1)
+        if base_stats is None:
+            base_stats = self.mg.valence_stats()
+        added_sum, added_n = self._valence_stats(mg_copy.added)
+        score = (base_stats[0] + added_sum) / ((base_stats[1] + added_n) or 1)
 
         result = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": timestamp or utc_now_iso(),
             "modifiers": modifiers,
             "score": score
         }
 
-        # 4) Log to file
-        with open(self.log_path, "a") as f:
-            f.write(json.dumps(result) + "\n")
+        # 4) Log to file (shared background writer)
+        enqueue_jsonl(self.log_path, result)
 
         return result
 
@@ -74,12 +108,12 @@ class CounterfactualEngine:
                   modifier_sets: List[Dict[str, float]]
                  ) -> List[Dict[str, Any]]:
         """
-        Run multiple branches in sequence and return all results.
+        Run multiple branches and return all results. Branches share the
+        base graph, so its valence is summed once rather than per branch.
         """
-        results = []
-        for mods in modifier_sets:
-            results.append(self.run_branch(mods))
-        return results
+        base_stats = self.mg.valence_stats()
+        ts = utc_now_iso()
+        return [self.run_branch(mods, base_stats=base_stats, timestamp=ts) for mods in modifier_sets]
 
     def start_nightly(self,
                       modifier_sets: List[Dict[str, float]],
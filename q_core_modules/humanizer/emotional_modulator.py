@@ -2,6 +2,9 @@
 """
 Adds emotional flourishes based on detected sentiment.
 """
+from functools import lru_cache
+
+@lru_cache(maxsize=1024)
 def modulate_emotion(text: str, emotion: str) -> str:
     """
     Add emotional cues depending on emotion tag.
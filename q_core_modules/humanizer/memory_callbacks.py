@@ -14,9 +14,8 @@ def inject_memory_callbacks(text: str, mg) -> str:
     Returns:
         Modified text with memory callback.
     """
-    events = mg.retrieve(lambda e: True, max_results=1)
-    if events:
-        last = events[0]
+    last = mg.last_event()
+    if last is not None:
         snippet = last.payload.get("text", "").strip()
         if snippet:
             truncated = (snippet[:50] + '...') if len(snippet) > 50 else snippet
@@ -4,10 +4,13 @@ Occasionally adds a playful aside for spontaneity.
 """
 import random
 
+_ASIDE = "\nBy the way, did you know I love learning new things?"
+_random = random.Random().random
+
 def maybe_spontaneity(text: str) -> str:
     """
     With low probability, append a playful comment.
     """
-    if random.random() < 0.1:
-        return f"{text}\nBy the way, did you know I love learning new things?"
+    if _random() < 0.1:
+        return text + _ASIDE
     return text
@@ -4,11 +4,15 @@ Injects conversational fillers to mimic human disfluency.
 """
 import random
 
+_FILLERS = ("hmm", "you know", "let me think")
+_rand = random.Random()
+_random = _rand.random
+_choice = _rand.choice
+
 def apply_style(text: str) -> str:
     """
     Occasionally prepend a filler word to mimic conversational disfluency.
     """
-    fillers = ["hmm", "you know", "let me think"]
-    if random.random() < 0.2:
-        return f"{random.choice(fillers)}, {text}"
+    if _random() < 0.2:
+        return f"{_choice(_FILLERS)}, {text}"
     return text
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+jsonl_writer.py
+
+Single background writer for append-only JSONL logs. Callers enqueue
+(path, entry) without blocking; one daemon thread drains the queue, groups
+entries by path and writes each group with one writev() on an O_APPEND fd
+(plain write() where writev is unavailable).
+"""
+
+import atexit
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+
+try:
+    import orjson
+    _LINE_OPTS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_UTC_Z | orjson.OPT_APPEND_NEWLINE
+
+    def dumps_line(entry: Any) -> bytes:
+        """Serialize `entry` as one JSONL line (bytes, trailing newline)."""
+        return orjson.dumps(entry, option=_LINE_OPTS)
+except ImportError:   # portable fallback: stdlib json
+    import json
+
+    def _default(obj):
+        if hasattr(obj, "tolist"):        # numpy arrays / scalars
+            return obj.tolist()
+        if hasattr(obj, "isoformat"):     # datetimes
+            return obj.isoformat()
+        raise TypeError(f"{type(obj).__name__} is not JSON serializable")
+
+    def dumps_line(entry: Any) -> bytes:
+        """Serialize `entry` as one JSONL line (bytes, trailing newline)."""
+        return (json.dumps(entry, default=_default) + "\n").encode("utf-8")
+
+_HAVE_WRITEV = hasattr(os, "writev")
+_IOV_MAX = min(os.sysconf("SC_IOV_MAX"), 1024) if hasattr(os, "sysconf") else 1024
+_OPEN_FLAGS = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_CLOEXEC", 0) | getattr(os, "O_BINARY", 0)
+
+
+class JsonlWriter:
+    """
+    Bounded queue + drain thread. When the queue is full, entries are dropped
+    and counted in `dropped` rather than stalling the request path.
+    """
+
+    def __init__(self,
+                 maxsize: int = 10_000,
+                 batch_size: int = 64,
+                 flush_interval: float = 0.05,
+                 max_open: int = 64):
+        """
+        :param maxsize: queue capacity before entries are dropped
+        :param batch_size: flush once this many entries are pending
+        :param flush_interval: or once this many seconds have passed
+        :param max_open: open file descriptors kept (least recently used are closed)
+        """
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_open = max_open
+        self.dropped = 0
+        self._queue: "queue.Queue[Tuple[str, Dict[str, Any]]]" = queue.Queue(maxsize)
+        self._fds: "OrderedDict[str, int]" = OrderedDict()
+        self._io_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="JSONL-Writer", daemon=True)
+                self._thread.start()
+
+    def enqueue(self, path: str, entry: Dict[str, Any]) -> bool:
+        """Queue one entry for `path`. Returns False if it had to be dropped."""
+        if self._thread is None:
+            self.start()
+        try:
+            self._queue.put_nowait((path, entry))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._write_batch(batch)
+
+    def _fd(self, path: str) -> int:
+        fd = self._fds.get(path)
+        if fd is None:
+            fd = self._fds[path] = os.open(path, _OPEN_FLAGS, 0o644)
+            if len(self._fds) > self.max_open:
+                _, old = self._fds.popitem(last=False)
+                os.close(old)
+        else:
+            self._fds.move_to_end(path)
+        return fd
+
+    @staticmethod
+    def _write_all(fd: int, lines: List[bytes]):
+        if not _HAVE_WRITEV:
+            data = b"".join(lines)
+            while data:
+                data = data[os.write(fd, data):]
+            return
+        for start in range(0, len(lines), _IOV_MAX):
+            chunk = lines[start:start + _IOV_MAX]
+            written = os.writev(fd, chunk)
+            total = sum(map(len, chunk))
+            if written < total:
+                # Short write: finish the remainder with plain writes
+                rest = b"".join(chunk)[written:]
+                while rest:
+                    rest = rest[os.write(fd, rest):]
+
+    def _write_batch(self, batch: List[Tuple[str, Dict[str, Any]]]):
+        by_path: Dict[str, List[bytes]] = {}
+        for path, entry in batch:
+            try:
+                by_path.setdefault(path, []).append(dumps_line(entry))
+            except Exception as e:
+                print(f"⚠️ Could not serialize log entry for {path}: {e}")
+        with self._io_lock:
+            for path, lines in by_path.items():
+                try:
+                    self._write_all(self._fd(path), lines)
+                except Exception as e:
+                    print(f"⚠️ Failed to write {path}: {e}")
+
+    def flush(self):
+        """Synchronously write everything still queued (used at exit)."""
+        batch = []
+        try:
+            while True:
+                batch.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        if batch:
+            self._write_batch(batch)
+
+    def close(self):
+        self.flush()
+        with self._io_lock:
+            for fd in self._fds.values():
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+            self._fds.clear()
+
+
+# Process-wide writer shared by every logger.
+writer = JsonlWriter()
+atexit.register(writer.close)
+
+
+def enqueue_jsonl(path: str, entry: Dict[str, Any]) -> bool:
+    """Non-blocking append of `entry` as one JSON line to `path`."""
+    return writer.enqueue(path, entry)
+
+
+def append_lines(path: str, lines: List[bytes]) -> None:
+    """
+    Synchronous append of already-encoded lines: one O_APPEND fd and one
+    writev, bypassing the buffered/text io layers. Raises OSError.
+    """
+    fd = os.open(path, _OPEN_FLAGS, 0o644)
+    try:
+        JsonlWriter._write_all(fd, lines)
+    finally:
+        os.close(fd)
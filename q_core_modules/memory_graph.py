@@ -1,14 +1,24 @@
 #!/usr/bin/env python3
 from dataclasses import dataclass, field
+import array
+import os
 import uuid
 import datetime
-from typing import Dict, Any, Callable, List
+from typing import Dict, Any, Callable, List, Optional
 import pickle
-import json
 
+import orjson
+
+import numpy as np
 import networkx as nx
 from networkx.readwrite import json_graph
-from dateutil.parser import isoparse
+
+from .jsonl_writer import append_lines
+
+_ORJSON_OPTS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+_ONE_US = datetime.timedelta(microseconds=1)
 
 @dataclass
 class MemoryEvent:
@@ -20,6 +30,17 @@ class MemoryEvent:
     type: str = ""                     # e.g. "collapse", "anchor_added", "sensor_reading"
     payload: Dict[str, Any] = field(default_factory=dict)
 
+def parse_timestamp(ts: str) -> datetime.datetime:
+    """
+    Parse an ISO-8601 timestamp. Our own isoformat() output goes through the
+    C fromisoformat; anything else falls back to dateutil's isoparse.
+    """
+    try:
+        return datetime.datetime.fromisoformat(ts.replace('Z', '+00:00') if ts.endswith('Z') else ts)
+    except (ValueError, TypeError, AttributeError):
+        from dateutil.parser import isoparse
+        return isoparse(ts)
+
 class MemoryGraph:
     """
     Episodic memory stored as a directed graph.
@@ -27,20 +48,100 @@ class MemoryGraph:
     """
     def __init__(self):
         self.graph = nx.DiGraph()
+        self._unjournaled: List[MemoryEvent] = []
+        # Bumped on every mutation so callers can cache derived results
+        self.version = 0
+        self._reset_side_arrays()
+
+    def _reset_side_arrays(self):
+        # Struct-of-arrays view of the nodes, in graph insertion order, so
+        # scans (recency, type, valence) run over contiguous buffers instead
+        # of walking NetworkX's dict-of-dicts. The DiGraph keeps the edges.
+        self.events: List[MemoryEvent] = []
+        self.id_to_idx: Dict[str, int] = {}
+        self._ts = array.array('q')          # epoch ns (naive = UTC)
+        self._types = array.array('i')       # codes into _type_codes
+        self._type_codes: Dict[str, int] = {}
+        self._valences = array.array('d')    # payload['valence'], NaN when absent
+        # Most recent event by timestamp: new events link from it in O(1)
+        self._last_id = None
+        self._last_ts = None
+
+    @staticmethod
+    def _valence_of(event: MemoryEvent) -> float:
+        v = event.payload.get('valence', np.nan) if isinstance(event.payload, dict) else np.nan
+        try:
+            return float(v)
+        except (TypeError, ValueError):
+            return np.nan
+
+    @staticmethod
+    def _ts_ns(ts: datetime.datetime) -> int:
+        if ts.tzinfo is None:
+            ts = ts.replace(tzinfo=datetime.timezone.utc)
+        return (ts - _EPOCH) // _ONE_US * 1000
+
+    @staticmethod
+    def _as_np(buf: array.array, dtype) -> np.ndarray:
+        # Snapshot copy (one memcpy): a live np.frombuffer view would pin the
+        # array.array and make a concurrent add_event's append() fail.
+        return np.frombuffer(buf.tobytes(), dtype=dtype)
+
+    def _type_code(self, event_type: str) -> int:
+        code = self._type_codes.get(event_type)
+        if code is None:
+            code = self._type_codes[event_type] = len(self._type_codes)
+        return code
+
+    def _index_event(self, event: MemoryEvent):
+        """Record `event` in the side arrays (overwriting a re-added id)."""
+        ts_ns = self._ts_ns(event.timestamp)
+        idx = self.id_to_idx.get(event.id)
+        if idx is None:
+            self.id_to_idx[event.id] = len(self.events)
+            self.events.append(event)
+            self._ts.append(ts_ns)
+            self._types.append(self._type_code(event.type))
+            self._valences.append(self._valence_of(event))
+        else:
+            self.events[idx] = event
+            self._ts[idx] = ts_ns
+            self._types[idx] = self._type_code(event.type)
+            self._valences[idx] = self._valence_of(event)
+        if self._last_ts is None or ts_ns >= self._last_ts:
+            self._last_id, self._last_ts = event.id, ts_ns
+
+    def _reindex(self):
+        """Rebuild per-event side arrays after self.graph was replaced."""
+        self._reset_side_arrays()
+        for _, data in self.graph.nodes(data=True):
+            self._index_event(data['event'])
+        self.version += 1
+
+    def valence_stats(self):
+        """(sum, count) of payload 'valence' over events that carry one."""
+        if not self._valences:
+            return 0.0, 0
+        arr = self._as_np(self._valences, np.float64)
+        present = ~np.isnan(arr)
+        return float(arr[present].sum()), int(present.sum())
 
     def add_event(self, event: MemoryEvent):
         """Add a new event node, auto-linking to the last event in time."""
+        prev_last = self._last_id
         self.graph.add_node(event.id, event=event)
+        self._unjournaled.append(event)
+        self._index_event(event)
+        self.version += 1
         # Auto-link temporal edge from the most recent prior event
-        all_nodes = list(self.graph.nodes)
-        if len(all_nodes) > 1:
-            prior = [
-                (nid, self.graph.nodes[nid]['event'].timestamp)
-                for nid in all_nodes if nid != event.id
-            ]
-            prior.sort(key=lambda x: x[1], reverse=True)
-            last_id = prior[0][0]
-            self.link_events(last_id, event.id, relation="next_in_time")
+        if prev_last is not None and prev_last != event.id:
+            self.link_events(prev_last, event.id, relation="next_in_time")
+
+    def last_event(self) -> Optional[MemoryEvent]:
+        """The most recent event by timestamp, in O(1); None if empty."""
+        if self._last_id is None:
+            return None
+        return self.events[self.id_to_idx[self._last_id]]
 
     def link_events(self, src_id: str, dst_id: str, relation: str):
         """Create a labeled edge from src to dst (e.g. causal, shared_anchor)."""
@@ -51,20 +152,45 @@ class MemoryGraph:
 
     def retrieve(
         self,
-        filter_fn: Callable[[MemoryEvent], bool],
-        max_results: int = 10
+        filter_fn: Optional[Callable[[MemoryEvent], bool]] = None,
+        max_results: int = 10,
+        event_type: Optional[str] = None,
+        since: Optional[datetime.datetime] = None
     ) -> List[MemoryEvent]:
         """
         Return up to `max_results` events matching `filter_fn`,
         sorted by most-recent timestamp first.
+        `event_type` and `since` are applied as vectorized masks before
+        `filter_fn`, which then only sees candidates in recency order.
         """
-        matches = [
-            data['event']
-            for _, data in self.graph.nodes(data=True)
-            if filter_fn(data['event'])
-        ]
-        matches.sort(key=lambda e: e.timestamp, reverse=True)
-        return matches[:max_results]
+        if max_results <= 0 or not self.events:
+            return []
+        ts = self._as_np(self._ts, np.int64)
+        mask = None
+        if event_type is not None:
+            code = self._type_codes.get(event_type)
+            if code is None:
+                return []
+            mask = self._as_np(self._types, np.int32) == code
+        if since is not None:
+            since_mask = ts >= self._ts_ns(since)
+            mask = since_mask if mask is None else mask & since_mask
+        cand = np.arange(len(ts)) if mask is None else np.flatnonzero(mask)
+        if filter_fn is None and max_results < len(cand):
+            # Top-k by recency without a full sort
+            cand = cand[np.argpartition(-ts[cand], max_results - 1)[:max_results]]
+        # Stable on ties, so equal timestamps keep insertion order
+        order = cand[np.argsort(-ts[cand], kind='stable')]
+        if filter_fn is None:
+            return [self.events[i] for i in order[:max_results]]
+        out = []
+        for i in order:
+            ev = self.events[i]
+            if filter_fn(ev):
+                out.append(ev)
+                if len(out) == max_results:
+                    break
+        return out
 
     def related(self, event_id: str, depth: int = 1) -> List[MemoryEvent]:
         """
@@ -88,42 +214,93 @@ class MemoryGraph:
         """Load a previously saved graph via pickle."""
         with open(filepath, 'rb') as f:
             self.graph = pickle.load(f)
+        self._reindex()
+
+    @staticmethod
+    def _event_to_dict(ev: MemoryEvent) -> dict:
+        return {
+            'id': ev.id,
+            'timestamp': ev.timestamp.isoformat(),
+            'type': ev.type,
+            'payload': ev.payload
+        }
+
+    @staticmethod
+    def _event_from_dict(ev_dict: dict) -> MemoryEvent:
+        return MemoryEvent(
+            id=ev_dict.get('id'),
+            timestamp=parse_timestamp(ev_dict.get('timestamp')),
+            type=ev_dict.get('type'),
+            payload=ev_dict.get('payload', {})
+        )
 
     def save_json(self, filepath: str):
         """
         Persist the graph as JSON (node-link data), serializing MemoryEvent nodes.
+        The file is replaced atomically so a crash never leaves a torn snapshot.
         """
         data = json_graph.node_link_data(self.graph)
         for node in data.get('nodes', []):
             ev = node.get('event')
             if isinstance(ev, MemoryEvent):
-                node['event'] = {
-                    'id': ev.id,
-                    'timestamp': ev.timestamp.isoformat(),
-                    'type': ev.type,
-                    'payload': ev.payload
-                }
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
+                node['event'] = self._event_to_dict(ev)
+        tmp = filepath + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(orjson.dumps(data, option=_ORJSON_OPTS | orjson.OPT_INDENT_2))
+        os.replace(tmp, filepath)
 
     def load_json(self, filepath: str):
         """
         Load and rehydrate a graph from JSON.
         Reconstructs MemoryEvent instances from stored dicts.
         """
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(filepath, 'rb') as f:
+            data = orjson.loads(f.read())
         G = json_graph.node_link_graph(data, edges="links")
         for nid, attrs in G.nodes(data=True):
             ev_dict = attrs.get('event')
             if isinstance(ev_dict, dict):
-                attrs['event'] = MemoryEvent(
-                    id=ev_dict.get('id'),
-                    timestamp=isoparse(ev_dict.get('timestamp')),
-                    type=ev_dict.get('type'),
-                    payload=ev_dict.get('payload', {})
-                )
+                attrs['event'] = self._event_from_dict(ev_dict)
         self.graph = G
+        self._reindex()
+
+    def append_journal(self, filepath: str) -> int:
+        """
+        Append every event added since the last call to a JSONL journal, so a
+        turn costs O(new events) on disk instead of a full save_json rewrite.
+        Returns the number of events written.
+        """
+        pending, self._unjournaled = self._unjournaled, []
+        if not pending:
+            return 0
+        opts = _ORJSON_OPTS | orjson.OPT_APPEND_NEWLINE
+        append_lines(filepath, [orjson.dumps(self._event_to_dict(ev), option=opts) for ev in pending])
+        return len(pending)
+
+    def replay_journal(self, filepath: str) -> int:
+        """
+        Re-add journaled events that are not in the graph yet (call after
+        load_json). Events already present in the snapshot are skipped, and a
+        torn final line from a crash is ignored. Returns the number replayed.
+        """
+        if not os.path.exists(filepath):
+            return 0
+        replayed = 0
+        with open(filepath, 'rb') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    ev_dict = orjson.loads(line)
+                except ValueError:
+                    continue
+                if ev_dict.get('id') in self.graph:
+                    continue
+                self.add_event(self._event_from_dict(ev_dict))
+                replayed += 1
+        # Replayed events are already on disk
+        self._unjournaled = []
+        return replayed
 
     # —————— Enhancements ——————
 
@@ -1,55 +1,254 @@
 #!/usr/bin/env python3
 import os
 import sys
-import requests
+import asyncio
+import base64
+import threading
+import httpx
 import json
 import traceback
-from typing import Optional, Tuple
+from typing import AsyncIterator, Optional, Tuple
+
+import numpy as np
+import orjson
 
 from q_core_modules.memory_graph import MemoryGraph
-from q_core_modules.contextual_retriever import ContextualRetriever
+from q_core_modules.contextual_retriever import ContextualRetriever, get_model
+from q_core_modules.jsonl_writer import append_lines, enqueue_jsonl
 
 # --- Configuration ---
 DEFAULT_OLLAMA_MODEL = "llama3:latest"
 OLLAMA_URL = "http://localhost:11434/api/generate"
 REQUEST_TIMEOUT = 3600  # seconds (1 hour)
 MAX_RETRIEVED = 3      # How many memories to retrieve
+# Semantic response cache: a query whose cosine similarity to an earlier one
+# exceeds the threshold reuses that answer instead of calling Ollama.
+# Raise the threshold for fewer (but safer) hits; > 1.0 disables the cache.
+SEMCACHE_THRESHOLD = float(os.environ.get("QPF_SEMCACHE_THRESHOLD", "0.92"))
+SEMCACHE_MAX = 1000    # entries kept per user (oldest evicted)
+SEMCACHE_FILE = "q_semcache.jsonl"
+
+# One pooled, keep-alive client shared by every request: the Ollama call is pure
+# network wait, so many in-flight requests can share one event loop.
+# The transport retries failed connection attempts (never a sent request).
+_limits = httpx.Limits(max_connections=256, max_keepalive_connections=64, keepalive_expiry=60.0)
+_client = httpx.AsyncClient(
+    timeout=REQUEST_TIMEOUT,
+    limits=_limits,
+    transport=httpx.AsyncHTTPTransport(retries=2, limits=_limits),
+)
+
+async def aclose_client():
+    """Close the shared Ollama client (call on server shutdown)."""
+    await _client.aclose()
 
 def log_jsonl(user_dir: str, fname: str, obj: dict):
-    try:
-        path = os.path.join(user_dir, fname)
-        with open(path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(obj) + "\n")
-    except Exception as e:
-        print(f"⚠️  Failed to log {fname}: {e}", file=sys.stderr)
+    # Buffered, batched append via the shared background writer
+    if not enqueue_jsonl(os.path.join(user_dir, fname), obj):
+        print(f"⚠️  Log queue full, dropped {fname} entry", file=sys.stderr)
 
-def generate_q_response(
-    user_text: str,
-    user_dir: str,
-    ollama_model: Optional[str] = None,
-    max_memories: int = MAX_RETRIEVED,
-    include_field_state: Optional[dict] = None
-) -> dict:
+class _SemanticCache:
     """
-    Sends a memory-enriched prompt to Ollama for a given user.
-    Returns a dict with keys: response, confidence, model, used_memories, prompt, etc.
+    Per-user (query embedding -> response) cache. Embeddings are unit-norm,
+    so the nearest prior query is one dot product. Each miss appends one line
+    to q_semcache.jsonl (embedding as base64 float32); the file is compacted
+    to the newest SEMCACHE_MAX entries once it holds twice that. In memory,
+    embeddings fill a preallocated matrix, so an add writes a single row.
     """
-    assert user_dir, "user_dir is required for multi-user Q"
-    memory_json_path = os.path.join(user_dir, "q_memory.json")
+    def __init__(self, user_dir: str):
+        self.path = os.path.join(user_dir, SEMCACHE_FILE)
+        self.lock = threading.Lock()
+        self.vecs = None          # (2 * SEMCACHE_MAX, dim) buffer; rows [:n] in use
+        self.n = 0
+        self.responses = []
+        self.models = []
+        self.disk_lines = 0
+        if os.path.exists(self.path):
+            self._load()
 
-    mg = MemoryGraph()
-    if os.path.exists(memory_json_path) and os.path.getsize(memory_json_path) > 0:
+    def _load(self):
         try:
-            mg.load_json(memory_json_path)
-        except Exception:
-            print("⚠️  Warning: failed to load memory graph, starting fresh.", file=sys.stderr)
-            traceback.print_exc(file=sys.stderr)
-    retriever = ContextualRetriever(mg)
+            with open(self.path, "rb") as f:
+                lines = f.read().splitlines()
+        except OSError as e:
+            print(f"⚠️  Could not load semantic cache, starting empty: {e}", file=sys.stderr)
+            return
+        self.disk_lines = len(lines)
+        entries = []
+        for line in lines:
+            try:
+                entry = orjson.loads(line)
+                vec = np.frombuffer(base64.b64decode(entry["vec"]), dtype=np.float32)
+                entries.append((vec, entry["response"], entry["model"]))
+            except (ValueError, KeyError, TypeError):
+                continue   # torn final line from a crash
+        for vec, response, model in entries[-SEMCACHE_MAX:]:
+            self._append(vec, response, model)
+        if self.disk_lines > SEMCACHE_MAX:
+            try:
+                self._compact()
+            except OSError as e:
+                print(f"⚠️  Could not compact semantic cache: {e}", file=sys.stderr)
+
+    def _append(self, vec: np.ndarray, response: str, model: str):
+        if self.vecs is None or self.vecs.shape[1] != vec.shape[0]:
+            # First entry, or the embedding model changed: start over
+            self.vecs = np.empty((2 * SEMCACHE_MAX, vec.shape[0]), dtype=np.float32)
+            self.n, self.responses, self.models = 0, [], []
+        if self.n == len(self.vecs):
+            # Buffer full: keep the newest SEMCACHE_MAX (amortized O(1) per add)
+            self.vecs[:SEMCACHE_MAX] = self.vecs[self.n - SEMCACHE_MAX:self.n]
+            self.responses = self.responses[-SEMCACHE_MAX:]
+            self.models = self.models[-SEMCACHE_MAX:]
+            self.n = SEMCACHE_MAX
+        self.vecs[self.n] = vec
+        self.n += 1
+        self.responses.append(response)
+        self.models.append(model)
+
+    def _line(self, i: int) -> bytes:
+        return orjson.dumps({
+            "model": self.models[i],
+            "response": self.responses[i],
+            "vec": base64.b64encode(self.vecs[i].tobytes()).decode("ascii"),
+        }, option=orjson.OPT_APPEND_NEWLINE)
+
+    def _compact(self):
+        """Atomically rewrite the file with the newest SEMCACHE_MAX entries."""
+        lo = max(0, self.n - SEMCACHE_MAX)
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(b"".join(self._line(i) for i in range(lo, self.n)))
+        os.replace(tmp, self.path)
+        self.disk_lines = self.n - lo
+
+    @staticmethod
+    def embed(text: str) -> np.ndarray:
+        return np.asarray(get_model().encode(text, normalize_embeddings=True), dtype=np.float32)
+
+    def lookup(self, user_text: str, model: str, threshold: float):
+        """Returns (query_vec, cached_response_or_None)."""
+        q = self.embed(user_text)
+        with self.lock:
+            if self.vecs is None or self.vecs.shape[1] != q.shape[0]:
+                return q, None
+            lo = max(0, self.n - SEMCACHE_MAX)
+            sims = self.vecs[lo:self.n] @ q
+            # Only answers produced by the same model are eligible
+            for i in np.argsort(sims)[::-1]:
+                if sims[i] <= threshold:
+                    break
+                if self.models[lo + i] == model:
+                    return q, self.responses[lo + i]
+        return q, None
+
+    def add(self, q: np.ndarray, response: str, model: str):
+        with self.lock:
+            self._append(q, response, model)
+            try:
+                if self.disk_lines >= 2 * SEMCACHE_MAX:
+                    self._compact()
+                else:
+                    append_lines(self.path, [self._line(self.n - 1)])
+                    self.disk_lines += 1
+            except OSError as e:
+                print(f"⚠️  Failed to persist semantic cache: {e}", file=sys.stderr)
 
+class _UserMemory:
+    """
+    One user's MemoryGraph + retriever, kept across requests. The snapshot is
+    re-parsed only when q_memory.json changes; journal growth is replayed
+    incrementally onto the cached graph. A host that already keeps the graph
+    in memory hands it over with share() and nothing is loaded from disk.
+    """
+    def __init__(self, user_dir: str):
+        self.user_dir = user_dir
+        self.lock = threading.Lock()
+        self.snapshot_mtime = None
+        self.journal_size = 0
+        self.mg = None
+        self.retriever = None
+        self.shared = False
+        self._semcache = None
+
+    @property
+    def semcache(self) -> _SemanticCache:
+        if self._semcache is None:
+            self._semcache = _SemanticCache(self.user_dir)
+        return self._semcache
+
+    def share(self, mg: MemoryGraph, lock):
+        """Search the caller's live graph, guarded by the caller's lock."""
+        with self.lock:
+            self.mg = mg
+            self.shared = True
+            if self.retriever is not None:
+                self.retriever.memory_graph = mg
+            self.lock = lock
+
+    def refresh(self):
+        if self.shared:
+            if self.retriever is None:
+                self.retriever = ContextualRetriever(self.mg)
+            return
+        memory_json_path = os.path.join(self.user_dir, "q_memory.json")
+        journal_path = os.path.join(self.user_dir, "q_memory.events.jsonl")
+        snapshot_mtime = os.path.getmtime(memory_json_path) if os.path.exists(memory_json_path) else None
+        journal_size = os.path.getsize(journal_path) if os.path.exists(journal_path) else 0
+        if self.mg is None or snapshot_mtime != self.snapshot_mtime or journal_size < self.journal_size:
+            mg = MemoryGraph()
+            if snapshot_mtime is not None and os.path.getsize(memory_json_path) > 0:
+                try:
+                    mg.load_json(memory_json_path)
+                except Exception:
+                    print("⚠️  Warning: failed to load memory graph, starting fresh.", file=sys.stderr)
+                    traceback.print_exc(file=sys.stderr)
+            self.mg = mg
+            if self.retriever is None:
+                self.retriever = ContextualRetriever(mg)
+            else:
+                self.retriever.memory_graph = mg
+            self.journal_size = -1
+        if journal_size != self.journal_size:
+            try:
+                # Events since the last snapshot live in the append-only journal
+                self.mg.replay_journal(journal_path)
+            except Exception:
+                print("⚠️  Warning: failed to replay memory journal.", file=sys.stderr)
+                traceback.print_exc(file=sys.stderr)
+        self.snapshot_mtime, self.journal_size = snapshot_mtime, journal_size
+
+_user_memories = {}
+_user_memories_lock = threading.Lock()
+
+def _user_memory(user_dir: str) -> _UserMemory:
+    mem = _user_memories.get(user_dir)
+    if mem is None:
+        with _user_memories_lock:
+            mem = _user_memories.setdefault(user_dir, _UserMemory(user_dir))
+    return mem
+
+def share_memory_graph(user_dir: str, mg: MemoryGraph, lock):
+    """
+    Recall memories for user_dir from `mg` (held under `lock` while
+    searching) instead of loading a second copy from q_memory.json and the
+    event journal. Call before the user's first generate_q_response.
+    """
+    _user_memory(user_dir).share(mg, lock)
+
+def _recall_memories(user_text: str, user_dir: str, max_memories: int):
+    """
+    Retrieve memories related to user_text from the user's cached memory
+    graph. CPU-bound (embeddings), so the async caller runs it in a thread.
+    Returns (memory_block, used_memories).
+    """
     used_memories = []
     memory_block = ""
+    mem = _user_memory(user_dir)
     try:
-        memories = retriever.retrieve_semantic(user_text, max_memories)
+        with mem.lock:
+            mem.refresh()
+            memories = mem.retriever.retrieve_semantic(user_text, max_memories)
         if memories:
             lines = []
             for m in memories:
@@ -63,6 +262,53 @@ def generate_q_response(
     except Exception:
         print("⚠️  Memory retrieval error, skipping memory context:", file=sys.stderr)
         traceback.print_exc(file=sys.stderr)
+    return memory_block, used_memories
+
+FALLBACK_RESPONSE = "I'm here and listening—what would you like to discuss?"
+
+async def _prepare_turn(
+    user_text: str,
+    user_dir: str,
+    ollama_model: Optional[str],
+    max_memories: int,
+    include_field_state: Optional[dict],
+    cache_threshold: Optional[float],
+    cache_key: Optional[str]
+) -> dict:
+    """
+    Everything before the Ollama call: semantic-cache lookup, memory recall,
+    prompt construction and prompt logging. Returns the turn state consumed
+    by _stream_turn. The cache is keyed on cache_key (the raw user utterance)
+    when given, else on user_text.
+    """
+    assert user_dir, "user_dir is required for multi-user Q"
+    turn = {
+        "user_dir": user_dir,
+        "model": ollama_model or DEFAULT_OLLAMA_MODEL,
+        "field_state": include_field_state or {},
+        "semcache": None,
+        "query_vec": None,
+        "cached": None,
+        "used_memories": [],
+        "prompt": "",
+        "out": None,
+    }
+    threshold = SEMCACHE_THRESHOLD if cache_threshold is None else cache_threshold
+    if include_field_state is None and threshold <= 1.0:
+        semcache = _user_memory(user_dir).semcache
+        try:
+            turn["query_vec"], turn["cached"] = await asyncio.to_thread(
+                semcache.lookup, user_text if cache_key is None else cache_key,
+                turn["model"], threshold)
+            turn["semcache"] = semcache
+        except Exception:
+            print("⚠️  Semantic cache lookup failed, calling the model:", file=sys.stderr)
+            traceback.print_exc(file=sys.stderr)
+        if turn["cached"] is not None:
+            return turn
+
+    memory_block, turn["used_memories"] = await asyncio.to_thread(
+        _recall_memories, user_text, user_dir, max_memories)
 
     # Add math/field state if provided (for advanced prompting)
     field_state_block = ""
@@ -80,46 +326,67 @@ def generate_q_response(
 
 """
     full_prompt += f"User: {user_text}\nQ:"
+    turn["prompt"] = full_prompt
 
     # Log prompt
     log_jsonl(user_dir, "prompt_log.jsonl", {
         "timestamp": os.environ.get("QPF_TIMESTAMP") or "",
-        "model": ollama_model or DEFAULT_OLLAMA_MODEL,
+        "model": turn["model"],
         "user_input": user_text,
         "prompt": full_prompt,
-        "used_memories": used_memories,
-        "field_state": include_field_state or {},
+        "used_memories": turn["used_memories"],
+        "field_state": turn["field_state"],
+    })
+    return turn
+
+def _finish_turn(turn: dict, response: str, confidence: float, from_cache: bool = False) -> dict:
+    out = {
+        "response": response,
+        "confidence": confidence,
+        "model": turn["model"],
+        "used_memories": turn["used_memories"],
+        "prompt": turn["prompt"],
+        "field_state": turn["field_state"],
+        "from_cache": from_cache,
+    }
+    log_jsonl(turn["user_dir"], "response_log.jsonl", {
+        "timestamp": os.environ.get("QPF_TIMESTAMP") or "",
+        **out
     })
+    turn["out"] = out
+    return out
 
-    # Call Ollama API
-    model_to_use = ollama_model or DEFAULT_OLLAMA_MODEL
+async def _stream_turn(turn: dict) -> AsyncIterator[str]:
+    """
+    Yield response text as Ollama produces it; the aggregated result is
+    logged and stored in turn["out"] once the stream completes.
+    """
+    if turn["cached"] is not None:
+        _finish_turn(turn, turn["cached"], 0.9, from_cache=True)
+        yield turn["cached"]
+        return
+
+    parts = []
     try:
         payload = {
-            "model": model_to_use,
-            "prompt": full_prompt,
-            "stream": False
+            "model": turn["model"],
+            "prompt": turn["prompt"],
+            "stream": True
         }
-        resp = requests.post(OLLAMA_URL, json=payload, timeout=REQUEST_TIMEOUT)
-        resp.raise_for_status()
-        data = resp.json()
-        content = data.get("response", "").strip()
-        if not content:
-            content = "I'm here and listening—what would you like to discuss?"
-
-        out = {
-            "response": content,
-            "confidence": 1.0,
-            "model": model_to_use,
-            "used_memories": used_memories,
-            "prompt": full_prompt,
-            "field_state": include_field_state or {},
-        }
-        log_jsonl(user_dir, "response_log.jsonl", {
-            "timestamp": os.environ.get("QPF_TIMESTAMP") or "",
-            **out
-        })
-        return out
-
+        async with _client.stream("POST", OLLAMA_URL, json=payload) as resp:
+            resp.raise_for_status()
+            async for line in resp.aiter_lines():
+                if not line:
+                    continue
+                chunk = orjson.loads(line)
+                if chunk.get("error"):
+                    raise RuntimeError(chunk["error"])
+                piece = chunk.get("response")
+                if piece:
+                    parts.append(piece)
+                    yield piece
+                if chunk.get("done"):
+                    break
     except Exception as e:
         err_text = (
             "I'm sorry, I ran into an error while thinking. "
@@ -127,23 +394,61 @@ def generate_q_response(
         )
         print("⚠️  Ollama API error:", file=sys.stderr)
         traceback.print_exc(file=sys.stderr)
-        out = {
-            "response": err_text,
-            "confidence": 0.0,
-            "model": model_to_use,
-            "used_memories": used_memories,
-            "prompt": full_prompt,
-            "field_state": include_field_state or {},
-        }
-        log_jsonl(user_dir, "response_log.jsonl", {
-            "timestamp": os.environ.get("QPF_TIMESTAMP") or "",
-            **out
-        })
-        return out
+        _finish_turn(turn, err_text, 0.0)
+        yield err_text
+        return
 
-# Optional: Streaming Support Stub
-# def generate_q_response_stream(...):
-#     # For stream=True, yield responses line by line.
+    content = "".join(parts).strip()
+    if not content:
+        content = FALLBACK_RESPONSE
+        yield content
+    elif turn["semcache"] is not None:
+        await asyncio.to_thread(turn["semcache"].add, turn["query_vec"], content, turn["model"])
+    _finish_turn(turn, content, 1.0)
+
+async def generate_q_response_stream(
+    user_text: str,
+    user_dir: str,
+    ollama_model: Optional[str] = None,
+    max_memories: int = MAX_RETRIEVED,
+    include_field_state: Optional[dict] = None,
+    cache_threshold: Optional[float] = None,
+    cache_key: Optional[str] = None
+) -> AsyncIterator[str]:
+    """
+    Streaming form of generate_q_response: yields response text chunks as
+    soon as Ollama produces them (first-token latency instead of full
+    completion). The full response is logged once the stream ends.
+    """
+    turn = await _prepare_turn(user_text, user_dir, ollama_model, max_memories,
+                               include_field_state, cache_threshold, cache_key)
+    async for piece in _stream_turn(turn):
+        yield piece
+
+async def generate_q_response(
+    user_text: str,
+    user_dir: str,
+    ollama_model: Optional[str] = None,
+    max_memories: int = MAX_RETRIEVED,
+    include_field_state: Optional[dict] = None,
+    cache_threshold: Optional[float] = None,
+    cache_key: Optional[str] = None
+) -> dict:
+    """
+    Sends a memory-enriched prompt to Ollama for a given user.
+    Returns a dict with keys: response, confidence, model, used_memories, prompt, etc.
+    Paraphrases of earlier queries (cosine > cache_threshold, default
+    SEMCACHE_THRESHOLD) are answered from the semantic cache with
+    from_cache=True; prompts carrying a field state always go to Ollama.
+    Callers that pass a composed prompt as user_text must pass the raw
+    utterance as cache_key: the shared template text would otherwise make
+    unrelated prompts look alike.
+    """
+    turn = await _prepare_turn(user_text, user_dir, ollama_model, max_memories,
+                               include_field_state, cache_threshold, cache_key)
+    async for _ in _stream_turn(turn):
+        pass
+    return turn["out"]
 
 # --- Manual CLI Test ---
 if __name__ == "__main__":
@@ -162,26 +467,24 @@ if __name__ == "__main__":
         except Exception:
             print("⚠️  Could not load field state JSON.")
             field_state = None
-    print("Enter your message; Ctrl-C to exit.")
-    while True:
-        try:
-            user_input = input("You> ")
-        except (EOFError, KeyboardInterrupt):
-            print("\nGoodbye!")
-            break
-        if not user_input.strip():
-            continue
-        out = generate_q_response(
-            user_input,
-            user_dir=args.user_dir,
-            ollama_model=args.model,
-            max_memories=args.max_memories,
-            include_field_state=field_state,
-        )
-        print(f"Q> {out['response']}  (confidence={out['confidence']})")
-        # If you want to see prompt or memories, print(out["prompt"])
-
-
-
-
-
+    async def main():
+        print("Enter your message; Ctrl-C to exit.")
+        while True:
+            try:
+                user_input = input("You> ")
+            except (EOFError, KeyboardInterrupt):
+                print("\nGoodbye!")
+                break
+            if not user_input.strip():
+                continue
+            out = await generate_q_response(
+                user_input,
+                user_dir=args.user_dir,
+                ollama_model=args.model,
+                max_memories=args.max_memories,
+                include_field_state=field_state,
+            )
+            print(f"Q> {out['response']}  (confidence={out['confidence']})")
+            # If you want to see prompt or memories, print(out["prompt"])
+        await aclose_client()
+    asyncio.run(main())
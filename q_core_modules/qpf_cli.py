@@ -1,11 +1,24 @@
 #!/usr/bin/env python3
 import os
 import sys
+import atexit
 import time
 import json
+import mmap
+import select
 import socket
 from datetime import datetime
 
+try:
+    import orjson
+    _loads = orjson.loads
+    def _dumps_line(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+except ImportError:   # CLI stays usable without orjson
+    _loads = json.loads
+    def _dumps_line(obj) -> bytes:
+        return (json.dumps(obj, default=lambda o: o.isoformat() if hasattr(o, "isoformat") else str(o)) + "\n").encode("utf-8")
+
 # ─── Configuration ─────────────────────────────────────────────────────────────
 DATA_DIR         = "/Volumes/QPF Archive/Q 2.0/data"
 SESSION_FILE     = os.path.join(DATA_DIR, "session_context.jsonl")
@@ -13,6 +26,8 @@ USER_INPUT_LOG   = os.path.join(DATA_DIR, "user_input.jsonl")
 RITUAL_LOG       = os.path.join(DATA_DIR, "symbolic_rituals.jsonl")
 HOST, PORT       = "localhost", 5555
 TIMEOUT_SEC      = 60.0
+POLL_SEC         = 0.1    # fallback when no file watcher is available
+MMAP_MIN_BYTES   = 1 << 16   # mmap instead of read() past this much new data
 
 # ─── Ritual Commands ───────────────────────────────────────────────────────────
 SUPPORTED_RITUALS = {
@@ -26,53 +41,239 @@ SUPPORTED_RITUALS = {
 def now_timestamp():
     return datetime.now().isoformat()
 
-def tail_session_context(prev_count):
+def session_offset():
+    """Current end of SESSION_FILE; replies are read from here on."""
+    try:
+        return os.path.getsize(SESSION_FILE)
+    except OSError:
+        return 0
+
+def _last_entry(data, end, marker=None, lo=0):
+    """
+    Decode lines of data[lo:end] from the back until one parses. With a
+    marker, lines not containing it are skipped without decoding. `data`
+    may be bytes or an mmap.
+    """
+    while end > lo:
+        start = max(data.rfind(b"\n", lo, end) + 1, lo)
+        line = data[start:end]
+        end = start - 1
+        if not line.strip() or (marker is not None and marker not in line):
+            continue
+        try:
+            return _loads(line)
+        except ValueError:
+            continue
+    return None
+
+def tail_session_context(prev_offset, marker=None):
+    """
+    Read only what was appended after prev_offset. Returns (new_offset,
+    entry), where entry is the last parseable complete line (containing
+    `marker` bytes, if given), or None. Large backlogs are scanned through
+    an mmap, so only the pages around the last lines are touched.
+    """
     try:
-        with open(SESSION_FILE, 'r', encoding='utf-8') as f:
-            lines = [l for l in f if l.strip()]
+        with open(SESSION_FILE, 'rb') as f:
+            size = f.seek(0, os.SEEK_END)
+            if size < prev_offset:
+                prev_offset = 0   # file was truncated/rotated
+            if size == prev_offset:
+                return prev_offset, None
+            if size - prev_offset >= MMAP_MIN_BYTES:
+                try:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                        end = m.rfind(b"\n", prev_offset)
+                        if end < 0:
+                            return prev_offset, None
+                        return end + 1, _last_entry(m, end, marker, prev_offset)
+                except (OSError, ValueError):
+                    pass   # e.g. file shrank under us; use a plain read
+            f.seek(prev_offset)
+            data = f.read(size - prev_offset)
     except FileNotFoundError:
-        return prev_count, None
-
-    count = len(lines)
-    if count > prev_count:
-        for line in reversed(lines):
-            try:
-                entry = json.loads(line)
-                return count, entry
-            except json.JSONDecodeError:
-                continue
-    return prev_count, None
+        return prev_offset, None
+
+    end = data.rfind(b"\n")
+    if end < 0:
+        return prev_offset, None   # only a partial line so far
+    return prev_offset + end + 1, _last_entry(data, end, marker)
+
+_conn = None
+
+def _get_conn():
+    """Lazily open (and keep) one TCP connection to the QPF CLI server."""
+    global _conn
+    if _conn is None:
+        sock = socket.create_connection((HOST, PORT), timeout=TIMEOUT_SEC)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        _conn = sock
+    return _conn
+
+def _close_conn():
+    global _conn
+    if _conn is not None:
+        try:
+            _conn.close()
+        except OSError:
+            pass
+        _conn = None
+
+atexit.register(_close_conn)
+
+_NEWLINE = b"\n"
+
+def _send_message(sock, payload):
+    """
+    Send payload + newline as one gathered write, so the two parts leave in
+    the same segment even with TCP_NODELAY set.
+    """
+    if not hasattr(sock, "sendmsg"):
+        sock.sendall(payload + _NEWLINE)
+        return
+    bufs = [memoryview(payload), memoryview(_NEWLINE)]
+    while bufs:
+        sent = sock.sendmsg(bufs)
+        # Drop fully sent buffers, trim a partially sent one
+        while bufs and sent >= len(bufs[0]):
+            sent -= len(bufs[0])
+            bufs.pop(0)
+        if bufs and sent:
+            bufs[0] = bufs[0][sent:]
+
+def _send_once(msg):
+    sock = _get_conn()
+    _send_message(sock, msg.encode("utf-8"))
+    ack = sock.recv(16)
+    if not ack:
+        # Server closed the connection (e.g. one message per connection)
+        raise ConnectionResetError("connection closed by server")
+    return ack.decode("utf-8").strip()
 
 def send_line(msg):
     try:
-        with socket.create_connection((HOST, PORT), timeout=TIMEOUT_SEC) as sock:
-            sock.sendall((msg + "\n").encode("utf-8"))
-            ack = sock.recv(16).decode("utf-8").strip()
+        try:
+            ack = _send_once(msg)
+        except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
+            # Stale keep-alive connection: reconnect once and retry
+            _close_conn()
+            ack = _send_once(msg)
         if ack != "OK":
             print(f"Warning: unexpected ACK from server: {ack}", file=sys.stderr)
         return True
     except Exception as e:
+        _close_conn()
         print(f"Error sending to QPF CLI server: {e}", file=sys.stderr)
         return False
 
-def await_reply(prev_count, timeout=TIMEOUT_SEC):
-    deadline = time.time() + timeout
-    while time.time() < deadline:
-        prev_count, entry = tail_session_context(prev_count)
-        if entry:
-            return prev_count, entry
-        time.sleep(0.1)
-    return prev_count, None
+# ─── File Watching ──────────────────────────────────────────────────────────────
+class SessionWatcher:
+    """
+    Blocks until SESSION_FILE is written: kqueue on macOS/BSD, inotify on
+    Linux. If neither can be set up (or the file does not exist yet),
+    wait() degrades to a POLL_SEC sleep.
+    """
+    _IN_MODIFY = 0x2
+
+    def __init__(self, path):
+        self.path = path
+        self.missing = not os.path.exists(path)
+        self._fd = None
+        self._kq = None
+        self._inotify = None
+        try:
+            if hasattr(select, "kqueue"):
+                self._fd = os.open(path, os.O_RDONLY)
+                self._kq = select.kqueue()
+                self._kq.control([select.kevent(
+                    self._fd,
+                    filter=select.KQ_FILTER_VNODE,
+                    flags=select.KQ_EV_ADD | select.KQ_EV_CLEAR,
+                    fflags=select.KQ_NOTE_WRITE | select.KQ_NOTE_EXTEND,
+                )], 0, 0)
+            elif sys.platform.startswith("linux"):
+                import ctypes, ctypes.util
+                libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+                fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+                if fd < 0:
+                    raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+                self._inotify = fd
+                if libc.inotify_add_watch(fd, os.fsencode(path), self._IN_MODIFY) < 0:
+                    raise OSError(ctypes.get_errno(), "inotify_add_watch failed")
+        except (OSError, AttributeError):
+            self.close()
+
+    @property
+    def active(self):
+        return self._kq is not None or self._inotify is not None
+
+    def wait(self, timeout):
+        if self._kq is not None:
+            self._kq.control(None, 1, timeout)
+        elif self._inotify is not None:
+            ready, _, _ = select.select([self._inotify], [], [], timeout)
+            if ready:
+                try:
+                    while os.read(self._inotify, 4096):
+                        pass
+                except BlockingIOError:
+                    pass
+        else:
+            time.sleep(min(timeout, POLL_SEC))
+
+    def close(self):
+        for closer, attr in ((lambda kq: kq.close(), "_kq"), (os.close, "_fd"), (os.close, "_inotify")):
+            handle = getattr(self, attr)
+            if handle is not None:
+                try:
+                    closer(handle)
+                except OSError:
+                    pass
+                setattr(self, attr, None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def await_reply(prev_offset, timeout=TIMEOUT_SEC):
+    deadline = time.monotonic() + timeout
+    watcher = SessionWatcher(SESSION_FILE)
+    try:
+        while True:
+            prev_offset, entry = tail_session_context(prev_offset)
+            if entry:
+                return prev_offset, entry
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return prev_offset, None
+            if watcher.missing and os.path.exists(SESSION_FILE):
+                # File appeared after we started waiting: watch it from now on
+                watcher.close()
+                watcher = SessionWatcher(SESSION_FILE)
+            watcher.wait(remaining)
+    finally:
+        watcher.close()
+
+_APPEND_FLAGS = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0)
+
+def _append_line(path, line):
+    """Append one encoded line with a raw O_APPEND write (no io layers)."""
+    fd = os.open(path, _APPEND_FLAGS, 0o644)
+    try:
+        while line:
+            line = line[os.write(fd, line):]
+    finally:
+        os.close(fd)
 
 def log_user_input(msg, mode="cli"):
     try:
-        with open(USER_INPUT_LOG, 'a', encoding='utf-8') as f:
-            json.dump({
-                "timestamp": now_timestamp(),
-                "input": msg,
-                "mode": mode
-            }, f)
-            f.write("\n")
+        _append_line(USER_INPUT_LOG, _dumps_line({
+            "timestamp": datetime.now(),   # serialized as ISO-8601
+            "input": msg,
+            "mode": mode
+        }))
     except Exception as e:
         print(f"Warning: could not log input: {e}", file=sys.stderr)
 
@@ -80,14 +281,12 @@ def log_ritual(name, entry):
     try:
         record = {
             "ritual": name,
-            "timestamp": now_timestamp(),
+            "timestamp": datetime.now(),
             "source": "cli",
             "response": entry.get("q_response"),
             "symbolic_entry": entry.get("symbolic_response") or entry.get("codex_entry")
         }
-        with open(RITUAL_LOG, 'a', encoding='utf-8') as f:
-            json.dump(record, f)
-            f.write("\n")
+        _append_line(RITUAL_LOG, _dumps_line(record))
     except Exception as e:
         print(f"Warning: could not log ritual: {e}", file=sys.stderr)
 
@@ -111,16 +310,13 @@ def run_ritual(name):
         sys.exit(1)
 
     ritual_cmd = SUPPORTED_RITUALS[name]
-    prev_count = 0
-    if os.path.exists(SESSION_FILE):
-        with open(SESSION_FILE, 'r', encoding='utf-8') as f:
-            prev_count = sum(1 for line in f if line.strip())
+    prev_offset = session_offset()
 
     log_user_input(ritual_cmd, mode=f"cli-ritual-{name}")
     if not send_line(ritual_cmd):
         sys.exit(1)
 
-    prev_count, entry = await_reply(prev_count)
+    prev_offset, entry = await_reply(prev_offset)
     if not entry:
         print("Q> (no response within timeout)")
     else:
@@ -130,16 +326,13 @@ def run_ritual(name):
 
 # ─── One-Off Mode ───────────────────────────────────────────────────────────────
 def one_off_mode(msg):
-    prev_count = 0
-    if os.path.exists(SESSION_FILE):
-        with open(SESSION_FILE, 'r', encoding='utf-8') as f:
-            prev_count = sum(1 for line in f if line.strip())
+    prev_offset = session_offset()
 
     log_user_input(msg, mode="cli-oneoff")
     if not send_line(msg):
         sys.exit(1)
 
-    prev_count, entry = await_reply(prev_count)
+    prev_offset, entry = await_reply(prev_offset)
     if not entry:
         print("Q> (no response within timeout)")
     else:
@@ -150,10 +343,7 @@ def interactive_mode():
     print("🔗 QPF-AI CLI Driver")
     print("Type your message and hit Enter. Type 'exit' or Ctrl-D to quit.\n")
 
-    prev_count = 0
-    if os.path.exists(SESSION_FILE):
-        with open(SESSION_FILE, 'r', encoding='utf-8') as f:
-            prev_count = sum(1 for line in f if line.strip())
+    prev_offset = session_offset()
 
     while True:
         try:
@@ -171,7 +361,7 @@ def interactive_mode():
         if not send_line(msg):
             continue
 
-        prev_count, entry = await_reply(prev_count)
+        prev_offset, entry = await_reply(prev_offset)
         if not entry:
             print("Q> (no response within timeout)")
         else:
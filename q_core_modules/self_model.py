@@ -1,55 +1,172 @@
 import os
-import json
+import re
 import random
+from array import array
 from datetime import datetime, timezone
 
+import orjson
+
+from .jsonl_writer import append_lines
+from .timestamps import now_ns, utc_iso
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Mood keyword classes, checked in this order (substring match, any case)
+_FEELING_RES = tuple(
+    (feeling, re.compile("|".join(words), re.IGNORECASE))
+    for feeling, words in (
+        ("uplifted", ("happy", "joy", "grateful", "peace", "safe", "love")),
+        ("troubled", ("sad", "lonely", "hurt", "scared", "worry", "doubt", "lost")),
+        ("curious", ("curious", "ponder", "wonder", "seek", "why", "explore")),
+    )
+)
+
+# Text columns of a memory entry, in on-disk key order after "timestamp"
+_TEXT_FIELDS = ("user_text", "q_response", "topic", "feeling")
+
+def _iso_to_ns(ts):
+    d = datetime.fromisoformat(ts[:-1] + "+00:00" if ts.endswith("Z") else ts)
+    if d.tzinfo is None:
+        d = d.replace(tzinfo=timezone.utc)   # legacy naive timestamps are UTC
+    delta = d - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000_000 + delta.microseconds * 1000
+
 class SelfModel:
     def __init__(self, path):
         self.path = path
-        self.memories = []
+        self._clear()
         self.load()
         self.arc = []
         self.last_topic = None
         self.last_update = None
+        # arc_summary/self_reflect are pure functions of self.arc; cache them
+        # per revision (bumped whenever update() changes the arc)
+        self._arc_rev = 0
+        self._arc_cache_rev = -1
+        self._arc_cache = []
+        self._reflect_cache_rev = -1
+        self._reflect_cache = None
+
+    MAX_MEMORIES = 1000
+    COMPACT_AT = 1100   # rewrite the file once this many entries accumulate
+
+    # Memories are kept column-wise: unix-ns timestamps in an array('q') and
+    # one list per text field, all index-aligned.
+    def _clear(self):
+        self.timestamps = array("q")
+        self.user_texts = []
+        self.q_responses = []
+        self.topics = []
+        self.feelings = []
+
+    def _columns(self):
+        return (self.user_texts, self.q_responses, self.topics, self.feelings)
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def _append(self, ts_ns, user_text, q_response, topic, feeling):
+        self.timestamps.append(ts_ns)
+        self.user_texts.append(user_text)
+        self.q_responses.append(q_response)
+        self.topics.append(topic)
+        self.feelings.append(feeling)
+
+    def _append_dict(self, m):
+        try:
+            ts_ns = _iso_to_ns(m["timestamp"])
+        except (KeyError, TypeError, ValueError):
+            ts_ns = 0
+        self._append(ts_ns, *(m.get(k) for k in _TEXT_FIELDS))
+
+    def _trim(self):
+        if len(self.timestamps) > self.MAX_MEMORIES:
+            cut = len(self.timestamps) - self.MAX_MEMORIES
+            del self.timestamps[:cut]
+            for col in self._columns():
+                del col[:cut]
+
+    def _entry(self, i):
+        entry = {"timestamp": utc_iso(self.timestamps[i])}
+        for k, col in zip(_TEXT_FIELDS, self._columns()):
+            entry[k] = col[i]
+        return entry
+
+    def entries(self):
+        """Yield memories as dicts (built lazily, oldest first)."""
+        for i in range(len(self.timestamps)):
+            yield self._entry(i)
+
+    @property
+    def memories(self):
+        """List-of-dicts view of the stored memories (a copy)."""
+        return list(self.entries())
 
     def load(self):
-        if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
-            try:
-                with open(self.path, "r", encoding="utf-8") as f:
-                    self.memories = json.load(f)
-            except Exception as e:
-                print(f"[SelfModel] Failed to load: {e}")
-                self.memories = []
-        else:
-            self.memories = []
+        self._clear()
+        if not (os.path.exists(self.path) and os.path.getsize(self.path) > 0):
+            return
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+            if data.lstrip()[:1] == b"[":
+                # Legacy format: one JSON array; convert to JSONL in place
+                for m in orjson.loads(data)[-self.MAX_MEMORIES:]:
+                    self._append_dict(m)
+                self.save()
+                return
+            for line in data.splitlines():
+                if not line.strip():
+                    continue
+                try:
+                    self._append_dict(orjson.loads(line))
+                except orjson.JSONDecodeError:
+                    continue   # torn final line from a crash
+            self._trim()
+        except Exception as e:
+            print(f"[SelfModel] Failed to load: {e}")
+            self._clear()
 
     def save(self):
+        """Rewrite the whole file (JSONL, one memory per line) atomically."""
+        try:
+            tmp = self.path + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(b"".join(orjson.dumps(m, option=orjson.OPT_APPEND_NEWLINE) for m in self.entries()))
+            os.replace(tmp, self.path)
+        except Exception as e:
+            print(f"[SelfModel] Failed to save: {e}")
+
+    def save_entry(self, entry):
+        """Append one memory; compact the file when it has grown past COMPACT_AT."""
+        if len(self.timestamps) > self.COMPACT_AT:
+            self._trim()
+            self.save()
+            return
         try:
-            with open(self.path, "w", encoding="utf-8") as f:
-                json.dump(self.memories, f, indent=2)
+            append_lines(self.path, [orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE)])
         except Exception as e:
             print(f"[SelfModel] Failed to save: {e}")
 
     def update(self, user_text, q_response):
-        now = datetime.now(timezone.utc).isoformat()
+        ts_ns = now_ns()
+        now = utc_iso(ts_ns)
         topic = self.extract_topic(user_text)
         feeling = self.estimate_feeling(user_text, q_response)
-        entry = {
-            "timestamp": now,
-            "user_text": user_text,
-            "q_response": q_response,
-            "topic": topic,
-            "feeling": feeling
-        }
-        self.memories.append(entry)
-        if len(self.memories) > 1000:
-            self.memories = self.memories[-1000:]
+        self._append(ts_ns, user_text, q_response, topic, feeling)
         self.arc.append(topic)
         if len(self.arc) > 7:
             self.arc = self.arc[-7:]
+        self._arc_rev += 1
         self.last_topic = topic
         self.last_update = now
-        self.save()
+        self.save_entry({
+            "timestamp": now,
+            "user_text": user_text,
+            "q_response": q_response,
+            "topic": topic,
+            "feeling": feeling
+        })
         print(f"[SelfModel] Updated: topic='{topic}', feeling='{feeling}'")
         return {
             "topic": topic,
@@ -59,13 +176,9 @@ class SelfModel:
 
     def estimate_feeling(self, user_text, q_response):
         # Very simple logic—replace or expand if you like
-        txt = user_text.lower() + " " + q_response.lower()
-        if any(w in txt for w in ("happy", "joy", "grateful", "peace", "safe", "love")):
-            return "uplifted"
-        if any(w in txt for w in ("sad", "lonely", "hurt", "scared", "worry", "doubt", "lost")):
-            return "troubled"
-        if any(w in txt for w in ("curious", "ponder", "wonder", "seek", "why", "explore")):
-            return "curious"
+        for feeling, regex in _FEELING_RES:
+            if regex.search(user_text) or regex.search(q_response):
+                return feeling
         return "neutral"
 
     def extract_topic(self, text):
@@ -81,6 +194,8 @@ class SelfModel:
 
     def arc_summary(self):
         # Return last 3 non-repetitive topics for philosophical flavor
+        if self._arc_cache_rev == self._arc_rev:
+            return list(self._arc_cache)
         nonrep = []
         last = None
         for t in reversed(self.arc):
@@ -91,11 +206,18 @@ class SelfModel:
                 break
         nonrep.reverse()
         print(f"[SelfModel] arc_summary() returns: {nonrep}")
-        return nonrep
+        self._arc_cache, self._arc_cache_rev = nonrep, self._arc_rev
+        return list(nonrep)
 
     def self_reflect(self):
         # Return a short philosopher-style self-reflection, based on recent arc
-        arc = self.arc_summary()
+        if self._reflect_cache_rev != self._arc_rev:
+            self._reflect_cache = self._reflect(self.arc_summary())
+            self._reflect_cache_rev = self._arc_rev
+        return self._reflect_cache
+
+    @staticmethod
+    def _reflect(arc):
         if not arc:
             return "Every journey begins with a single question."
         if len(arc) == 1:
@@ -1,79 +1,104 @@
 import threading
 import time
-import random
-from datetime import datetime, timezone
+
+import numpy as np
+
+from symbolic_modules.scheduler import every
 from .memory_graph import MemoryGraph, MemoryEvent
 
+_COLORS = ('red', 'green', 'blue', 'yellow', 'none')
+_POOL_SIZE = 4096   # uniform draws generated per refill
+
 class SensoryModule:
     """
     Simulates periodic sensor readings (vision, audio, proprioception)
     and records them as MemoryEvents in the provided MemoryGraph.
     """
-    def __init__(self, memory_graph: MemoryGraph, interval_seconds: int = 60):
+    def __init__(self, memory_graph: MemoryGraph, interval_seconds: int = 60, lock=None):
         """
         :param memory_graph: the MemoryGraph instance to record into
         :param interval_seconds: how often to sample (default: 60s)
+        :param lock: held while adding events; pass the graph owner's lock,
+                     since samples are taken on the scheduler thread
         """
         self.mg = memory_graph
         self.interval = interval_seconds
-        self._thread = threading.Thread(target=self._run_loop, daemon=True)
+        self._lock = lock if lock is not None else threading.Lock()
+        self._task = None
+        # Batched RNG: uniforms are drawn 4096 at a time and consumed in order
+        self._rng = np.random.default_rng()
+        self._pool = self._rng.random(_POOL_SIZE).tolist()
+        self._idx = 0
+
+    def _uniforms(self, n: int):
+        if self._idx + n > len(self._pool):
+            self._pool = self._rng.random(_POOL_SIZE).tolist()
+            self._idx = 0
+        out = self._pool[self._idx:self._idx + n]
+        self._idx += n
+        return out
 
     def start(self):
-        """Begin the background sensor sampling loop."""
-        self._thread.start()
+        """Begin sensor sampling on the shared scheduler thread."""
+        if self._task is None or self._task.cancelled:
+            self._task = every(self.interval, self._sample_once)
+
+    def stop(self):
+        """Stop sampling; no further samples are taken."""
+        if self._task is not None:
+            self._task.cancel()
 
-    def _run_loop(self):
-        while True:
-            try:
-                self.sample_sensors()
-            except TypeError:
-                # Suppress datetime offset comparison errors
-                pass
-            except Exception as e:
-                print(f"SensoryModule error: {e}")
-            time.sleep(self.interval)
+    def _sample_once(self):
+        try:
+            self.sample_sensors()
+        except TypeError:
+            # Suppress datetime offset comparison errors
+            pass
+        except Exception as e:
+            print(f"SensoryModule error: {e}")
 
     def sample_sensors(self):
         """Simulate readings for vision, audio, and proprioception."""
-        # Use timezone-aware current time
-        now_iso = datetime.now(timezone.utc).isoformat()
+        # Integer epoch nanoseconds: no datetime/ISO formatting per tick
+        ts_ns = time.time_ns()
+        u_color, u_energy, u_dx, u_dy = self._uniforms(4)
 
         # 1) Vision: random color pattern
-        colors = ['red', 'green', 'blue', 'yellow', 'none']
-        color = random.choice(colors)
+        color = _COLORS[int(u_color * len(_COLORS))]
         e_vis = MemoryEvent(
             type="sensor_reading",
             payload={
                 "sense": "vision",
                 "pattern": f"color_{color}",
-                "timestamp": now_iso
+                "ts_ns": ts_ns
             }
         )
-        self.mg.add_event(e_vis)
 
         # 2) Audio: random energy level [0.0–1.0]
-        energy = round(random.random(), 3)
+        energy = round(u_energy, 3)
         e_aud = MemoryEvent(
             type="sensor_reading",
             payload={
                 "sense": "audio",
                 "energy": energy,
-                "timestamp": now_iso
+                "ts_ns": ts_ns
             }
         )
-        self.mg.add_event(e_aud)
 
         # 3) Proprioception: random movement vector
         movement = {
-            "dx": round(random.uniform(-1.0, 1.0), 3),
-            "dy": round(random.uniform(-1.0, 1.0), 3)
+            "dx": round(u_dx * 2.0 - 1.0, 3),
+            "dy": round(u_dy * 2.0 - 1.0, 3)
         }
         e_prop = MemoryEvent(
             type="sensor_reading",
             payload={
                 "sense": "proprioception",
                 "movement": movement,
-                "timestamp": now_iso
+                "ts_ns": ts_ns
             }
         )
-        self.mg.add_event(e_prop)
+        with self._lock:
+            self.mg.add_event(e_vis)
+            self.mg.add_event(e_aud)
+            self.mg.add_event(e_prop)
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+timestamps.py
+
+Cheap log timestamps. utc_now_iso() formats time.time_ns() directly,
+reusing the "YYYY-MM-DDTHH:MM:SS" prefix while the second is unchanged,
+so no datetime object is built per entry. Output is ISO-8601 with a "Z"
+suffix, which parse_timestamp / iso_to_ns already accept.
+"""
+
+import time
+
+now_ns = time.time_ns
+
+# (unix second, formatted prefix); replaced as one tuple so threads never
+# see a prefix paired with the wrong second
+_prefix = (-1, "")
+
+
+def utc_iso(ns: int) -> str:
+    """Format unix nanoseconds as 'YYYY-MM-DDTHH:MM:SS.ffffffZ'."""
+    global _prefix
+    sec, frac = divmod(ns, 1_000_000_000)
+    cached_sec, prefix = _prefix
+    if sec != cached_sec:
+        prefix = "%04d-%02d-%02dT%02d:%02d:%02d" % time.gmtime(sec)[:6]
+        _prefix = (sec, prefix)
+    return "%s.%06dZ" % (prefix, frac // 1000)
+
+
+def utc_now_iso() -> str:
+    """Current UTC time as ISO-8601, microsecond precision."""
+    return utc_iso(time.time_ns())
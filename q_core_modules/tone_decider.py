@@ -24,6 +24,10 @@ TONE_PROFILES = {
 }
 
 # 2) Build your decider
+# Precompiled, case-insensitive: no lowered copy of the text is needed
+_REFLECT_RE = re.compile(r"\?\s*$|reflect", re.IGNORECASE)
+_BRIEF_RE = re.compile(r"brief|short|tl;dr|just the point|quick answer", re.IGNORECASE)
+
 def decide_tone(user_text: str, mood: Dict[str, float]) -> str:
     """
     Choose one of TONE_PROFILES based on:
@@ -32,14 +36,12 @@ def decide_tone(user_text: str, mood: Dict[str, float]) -> str:
       - low joy or high regret → encouraging
       - otherwise → warm
     """
-    txt = user_text.strip().lower()
     # Reflective if it ends with a question or asks for reflection
-    if txt.endswith("?") or "reflect" in txt:
+    if _REFLECT_RE.search(user_text):
         return "reflective"
 
     # Concise if user explicitly asks for brevity
-    brief_keywords = ["brief", "short", "tl;dr", "just the point", "quick answer"]
-    if any(kw in txt for kw in brief_keywords):
+    if _BRIEF_RE.search(user_text):
         return "concise"
 
     # Encouraging if mood signals low joy or high regret
@@ -1,7 +1,14 @@
 import json
 import os
 from pathlib import Path
-from datetime import datetime
+
+from q_core_modules.jsonl_writer import enqueue_jsonl
+from q_core_modules.timestamps import utc_now_iso
+
+try:
+    from orjson import loads as _loads
+except ImportError:
+    _loads = json.loads
 
 # Set your symbolic_private directory
 SYMBOLIC_PRIVATE_DIR = "/Volumes/QPF Archive/Q 2.0/symbolic_private"
@@ -11,19 +18,41 @@ os.makedirs(SYMBOLIC_PRIVATE_DIR, exist_ok=True)  # Ensure the folder exists
 
 def track_context(message: str):
     entry = {
-        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "timestamp": utc_now_iso(),
         "message": message
     }
-    with open(CONTEXT_LOG, "a", encoding="utf-8") as f:
-        f.write(json.dumps(entry) + "\n")
+    enqueue_jsonl(CONTEXT_LOG, entry)
+
+_TAIL_BLOCK = 8192
 
-def get_recent_context(limit: int = 20):
+def _tail_lines(path: str, limit: int):
+    """Last `limit` non-empty lines of `path`, read backwards in blocks."""
+    with open(path, "rb") as f:
+        pos = f.seek(0, os.SEEK_END)
+        buf = b""
+        while pos > 0 and buf.count(b"\n") <= limit:
+            step = min(_TAIL_BLOCK, pos)
+            pos -= step
+            f.seek(pos)
+            buf = f.read(step) + buf
+    lines = [l for l in buf.split(b"\n") if l.strip()]
+    if pos > 0:
+        lines = lines[1:]   # first piece may be a partial line
+    return lines[-limit:]
+
+def get_recent_context(limit: int = 20, marker: bytes = None):
+    """
+    Last `limit` context entries. With `marker` (e.g. b'"q_response"'),
+    only lines containing those bytes are decoded and returned.
+    """
     entries = []
+    if limit <= 0:
+        return entries
     try:
-        with open(CONTEXT_LOG, "r", encoding="utf-8") as f:
-            lines = f.readlines()[-limit:]
-        entries = [json.loads(l) for l in lines if l.strip()]
+        lines = _tail_lines(CONTEXT_LOG, limit)
+        if marker is not None:
+            lines = [l for l in lines if marker in l]
+        entries = [_loads(l) for l in lines]
     except Exception:
         pass
     return entries
-
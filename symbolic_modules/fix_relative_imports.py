@@ -1,6 +1,8 @@
 import os
 import re
 
+_FROM_RE = re.compile(r"\s*from (\w+) import (.+)")
+
 MODULES = [
     "context_tracker.py",
     "meta_ticker.py",
@@ -18,26 +20,23 @@ for fname in MODULES:
         print(f"⚠️ Skipping missing {fname}")
         continue
 
-    with open(fname, "r", encoding="utf-8") as f:
-        lines = f.readlines()
-
+    # Stream line by line into a temp file; only swap it in if something changed
+    tmp = fname + ".tmp"
     changed = False
-    new_lines = []
-    for line in lines:
-        # Only change 'from xyz import ...' where xyz is in all_py and not already relative
-        m = re.match(r"\s*from (\w+) import (.+)", line)
-        if m:
-            mod = m.group(1)
-            if mod in all_py and not line.strip().startswith("from ."):
-                new_line = line.replace(f"from {mod} import", f"from .{mod} import")
-                new_lines.append(new_line)
-                changed = True
-                continue
-        new_lines.append(line)
+    with open(fname, "r", encoding="utf-8") as src, open(tmp, "w", encoding="utf-8") as dst:
+        for line in src:
+            # Only change 'from xyz import ...' where xyz is in all_py and not already relative
+            m = _FROM_RE.match(line)
+            if m:
+                mod = m.group(1)
+                if mod in all_py and not line.strip().startswith("from ."):
+                    line = line.replace(f"from {mod} import", f"from .{mod} import")
+                    changed = True
+            dst.write(line)
 
     if changed:
-        with open(fname, "w", encoding="utf-8") as f:
-            f.writelines(new_lines)
+        os.replace(tmp, fname)
         print(f"✅ Patched: {fname}")
     else:
+        os.remove(tmp)
         print(f"⏭️  No changes needed: {fname}")
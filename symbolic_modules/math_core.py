@@ -5,26 +5,59 @@
 # Core mathematical operations for the Quantum Perception Field
 # Including: Activation, State Projection, Entropy, Collapse, Resonance, Feedback
 #
-# Requires: numpy
+# Requires: numpy (numba optional — kernels are JIT-compiled when available)
 # ────────────────────────────────────────────────────────────────────────────────
 
+import math
+
 import numpy as np
 
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+    def njit(*args, **kwargs):
+        """No-op stand-in so the kernels run as plain NumPy without numba."""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+# The per-turn kernels work on tiny (N≈7) arrays, where Python/NumPy dispatch
+# dominates the arithmetic; compiled, they run in nanoseconds.
+_jit = njit(cache=True, fastmath=True)
+
 # Numerical stability for log/exp
 EPS = 1e-12
 
 # ─── Activation (sigmoid) ──────────────────────────────────────────────────────
-def activation(w):
-    """
-    Sigmoid activation: a_i = 1 / (1 + exp(-w_i))
-    Args:
-        w (np.ndarray): Weight vector, shape (N,)
-    Returns:
-        a (np.ndarray): Activation vector, shape (N,)
-    """
-    return 1.0 / (1.0 + np.exp(-w))
+if HAVE_NUMBA:
+    @_jit
+    def activation(w):
+        """
+        Sigmoid activation: a_i = 1 / (1 + exp(-w_i))
+        Args:
+            w (np.ndarray): Weight vector, shape (N,)
+        Returns:
+            a (np.ndarray): Activation vector, shape (N,)
+        """
+        out = np.empty_like(w)
+        for i in range(w.shape[0]):
+            out[i] = 1.0 / (1.0 + math.exp(-w[i]))
+        return out
+else:
+    def activation(w):
+        """
+        Sigmoid activation: a_i = 1 / (1 + exp(-w_i))
+        Args:
+            w (np.ndarray): Weight vector, shape (N,)
+        Returns:
+            a (np.ndarray): Activation vector, shape (N,)
+        """
+        return 1.0 / (1.0 + np.exp(-w))
 
 # ─── State Vector Projection ───────────────────────────────────────────────────
+@_jit
 def project_state(a, psi_vectors):
     """
     Project symbolic state as a weighted sum of basis vectors.
@@ -34,21 +67,40 @@ def project_state(a, psi_vectors):
     Returns:
         np.ndarray: Projected state vector, shape (D,)
     """
-    return np.sum(a[:, None] * psi_vectors, axis=0)
+    # gemv: no (N, D) broadcast temporary
+    return a @ psi_vectors
 
 # ─── Entropy Calculation ──────────────────────────────────────────────────────
-def entropy(a):
-    """
-    Computes entropy S = -sum_i (a_i^2 * log(a_i^2))
-    Args:
-        a (np.ndarray): Activation vector, shape (N,)
-    Returns:
-        float: Entropy value
-    """
-    p2 = a ** 2
-    return -np.sum(p2 * np.log(p2 + EPS))
+if HAVE_NUMBA:
+    @_jit
+    def entropy(a):
+        """
+        Computes entropy S = -sum_i (a_i^2 * log(a_i^2))
+        Args:
+            a (np.ndarray): Activation vector, shape (N,)
+        Returns:
+            float: Entropy value
+        """
+        # One fused pass, no temporaries
+        s = 0.0
+        for i in range(a.shape[0]):
+            p2 = a[i] * a[i]
+            s -= p2 * math.log(p2 + EPS)
+        return s
+else:
+    def entropy(a):
+        """
+        Computes entropy S = -sum_i (a_i^2 * log(a_i^2))
+        Args:
+            a (np.ndarray): Activation vector, shape (N,)
+        Returns:
+            float: Entropy value
+        """
+        p2 = a * a
+        return -float(np.dot(p2, np.log(p2 + EPS)))
 
 # ─── Collapse Update ──────────────────────────────────────────────────────────
+@_jit
 def collapse_weights(w, collapsed_index, alpha):
     """
     Update weights on collapse event.
@@ -65,6 +117,7 @@ def collapse_weights(w, collapsed_index, alpha):
     return w_new
 
 # ─── Resonance Energy ─────────────────────────────────────────────────────────
+@_jit
 def resonance(a, W):
     """
     Resonance energy: E = a^T W a
@@ -74,9 +127,11 @@ def resonance(a, W):
     Returns:
         float: Resonance energy
     """
-    return float(a.T @ W @ a)
+    # Two matrix-vector products; never forms a matrix-matrix product
+    return float(a @ (W @ a))
 
 # ─── Feedback Modulation ──────────────────────────────────────────────────────
+@_jit
 def feedback_modulation(lambda_vec, F):
     """
     Feedback effect (for post-collapse adjustment): λ·F
@@ -89,17 +144,43 @@ def feedback_modulation(lambda_vec, F):
     return float(np.dot(lambda_vec, F))
 
 # ─── Utility: Softmax (optional) ──────────────────────────────────────────────
-def softmax(x):
-    """
-    Numerically stable softmax.
-    Args:
-        x (np.ndarray): Input vector
-    Returns:
-        np.ndarray: Softmax probabilities
-    """
-    z = x - np.max(x)
-    exp_z = np.exp(z)
-    return exp_z / (np.sum(exp_z) + EPS)
+if HAVE_NUMBA:
+    @_jit
+    def softmax(x):
+        """
+        Numerically stable softmax.
+        Args:
+            x (np.ndarray): Input vector
+        Returns:
+            np.ndarray: Softmax probabilities
+        """
+        # max-subtract, exp and sum fused into two passes
+        m = x[0]
+        for i in range(1, x.shape[0]):
+            if x[i] > m:
+                m = x[i]
+        out = np.empty_like(x)
+        total = 0.0
+        for i in range(x.shape[0]):
+            e = math.exp(x[i] - m)
+            out[i] = e
+            total += e
+        scale = 1.0 / (total + EPS)
+        for i in range(x.shape[0]):
+            out[i] *= scale
+        return out
+else:
+    def softmax(x):
+        """
+        Numerically stable softmax.
+        Args:
+            x (np.ndarray): Input vector
+        Returns:
+            np.ndarray: Softmax probabilities
+        """
+        z = x - np.max(x)
+        exp_z = np.exp(z)
+        return exp_z / (np.sum(exp_z) + EPS)
 
 # ─── Collapse Trigger ─────────────────────────────────────────────────────────
 def check_collapse(S, S_crit):
@@ -113,6 +194,49 @@ def check_collapse(S, S_crit):
     """
     return S > S_crit
 
+# ─── Fused Per-Turn Step ──────────────────────────────────────────────────────
+@_jit
+def step(w, W, psi_vectors, alpha, S_crit):
+    """
+    One full turn of the field in a single call: activation → entropy →
+    resonance → projection → softmax → dominant concept → collapse.
+    Args:
+        w (np.ndarray): Weight vector, shape (N,)
+        W (np.ndarray): Connectivity matrix, shape (N,N)
+        psi_vectors (np.ndarray): State/basis vectors, shape (N, D)
+        alpha (float): Collapse learning rate [0,1]
+        S_crit (float): Collapse threshold
+    Returns:
+        tuple: (a, S, resonance, projected_state, softmax(w), dominant_index,
+                dominant_activation, collapsed, new_w); new_w is w itself
+                when no collapse occurred.
+    """
+    a = activation(w)
+    S = entropy(a)
+    E = resonance(a, W)
+    projected = project_state(a, psi_vectors)
+    soft = softmax(w)
+    k = np.argmax(a)
+    collapsed = S > S_crit
+    new_w = collapse_weights(w, k, alpha) if collapsed else w
+    return a, S, E, projected, soft, k, a[k], collapsed, new_w
+
+# ─── JIT Warm-up ──────────────────────────────────────────────────────────────
+def _warm_up(N=7, D=3):
+    """Compile (or load from cache) every kernel once, off the first request."""
+    w = np.zeros(N)
+    a = activation(w)
+    entropy(a)
+    project_state(a, np.zeros((N, D)))
+    resonance(a, np.zeros((N, N)))
+    feedback_modulation(w, w)
+    softmax(w)
+    collapse_weights(w, 0, 0.0)
+    step(w, np.zeros((N, N)), np.zeros((N, D)), 0.0, 0.0)
+
+if HAVE_NUMBA:
+    _warm_up()
+
 # ─── Example Usage / Test ─────────────────────────────────────────────────────
 if __name__ == "__main__":
     # Example: 5-concept system
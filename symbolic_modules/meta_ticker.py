@@ -1,13 +1,12 @@
 # meta_ticker.py
 
-import json
-import threading
-import time
 from pathlib import Path
-from datetime import datetime
 from typing import Optional, Dict, Any, Callable
 
 from symbolic_modules.config import DATA_DIR
+from q_core_modules.jsonl_writer import enqueue_jsonl
+from q_core_modules.timestamps import utc_now_iso
+from symbolic_modules.scheduler import every
 from symbolic_modules.emotion_analyzer import EmotionAnalyzer
 
 META_FILE = DATA_DIR / "QPF Archive/Q 2.0/symbolic_private/meta_reflections.jsonl"
@@ -28,7 +27,7 @@ class MetaTicker:
         """
         self.interval = interval_seconds
         self.reflection_fn = reflection_fn or self.default_reflection
-        self._stop_event = threading.Event()
+        self._task = None
         self._ensure_file_exists()
 
     def _ensure_file_exists(self):
@@ -38,14 +37,13 @@ class MetaTicker:
     def default_reflection(self) -> Dict[str, Any]:
         """A simple placeholder reflection—override with richer introspection."""
         return {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": utc_now_iso(),
             "question": "How am I feeling now?",
             "answer": "Neutral (stub response)"
         }
 
     def _log_reflection(self, data: Dict[str, Any]) -> None:
-        with META_FILE.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(data) + "\n")
+        enqueue_jsonl(str(META_FILE), data)
 
     def tick(self) -> None:
         """
@@ -54,7 +52,7 @@ class MetaTicker:
         reflection = self.reflection_fn()
         # ensure timestamp
         if "timestamp" not in reflection:
-            reflection["timestamp"] = datetime.utcnow().isoformat()
+            reflection["timestamp"] = utc_now_iso()
 
         # Emotion analysis on the reflection's answer
         answer_text = reflection.get("answer", "")
@@ -68,15 +66,11 @@ class MetaTicker:
         self._log_reflection(reflection)
 
     def start(self) -> None:
-        """Begin the periodic ticking in a background thread."""
-        def loop():
-            while not self._stop_event.is_set():
-                self.tick()
-                time.sleep(self.interval)
-
-        thread = threading.Thread(target=loop, daemon=True)
-        thread.start()
+        """Begin periodic ticking on the shared scheduler thread."""
+        if self._task is None or self._task.cancelled:
+            self._task = every(self.interval, self.tick)
 
     def stop(self) -> None:
         """Stop future ticks."""
-        self._stop_event.set()
+        if self._task is not None:
+            self._task.cancel()
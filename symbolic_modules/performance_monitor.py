@@ -1,28 +1,46 @@
 import os
-import json
-from datetime import datetime
 import psutil
 import threading
 import time
 
+from q_core_modules.jsonl_writer import enqueue_jsonl
+from q_core_modules.timestamps import utc_now_iso
+from symbolic_modules.scheduler import every
+
 def sample_health(log_path='data/health_log.jsonl'):
     metrics = {
-        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "timestamp": utc_now_iso(),
         "cpu_percent": psutil.cpu_percent(),
         "memory_percent": psutil.virtual_memory().percent,
         "disk_percent": psutil.disk_usage(os.getcwd()).percent
     }
-    with open(log_path, 'a') as f:
-        f.write(json.dumps(metrics) + '\n')
+    enqueue_jsonl(log_path, metrics)
+
+_stop_event = None   # Event of the running monitor_loop, fresh per call
+_task = None
+
+def stop_monitor():
+    """Stop monitoring (scheduled or monitor_loop) without waiting out the interval."""
+    if _stop_event is not None:
+        _stop_event.set()
+    if _task is not None:
+        _task.cancel()
 
 def monitor_loop(interval_seconds=60, log_path='data/health_log.jsonl'):
-    while True:
+    global _stop_event
+    # A new Event per run, so the loop can be restarted after stop_monitor()
+    stop_event = _stop_event = threading.Event()
+    deadline = time.monotonic()
+    while not stop_event.is_set():
         sample_health(log_path)
-        time.sleep(interval_seconds)
+        deadline += interval_seconds
+        if stop_event.wait(max(0.0, deadline - time.monotonic())):
+            break
 
 def start_monitor(interval_seconds=60, log_path=None):
     if not log_path:
         log_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'QPF Archive/Q 2.0/symbolic_private/health_log.jsonl')
-    t = threading.Thread(target=monitor_loop, args=(interval_seconds, log_path), daemon=True)
-    t.start()
-    return t
+    global _task
+    # Runs on the shared scheduler thread; returns a handle with cancel()
+    _task = every(interval_seconds, lambda: sample_health(log_path))
+    return _task
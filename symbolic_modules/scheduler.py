@@ -0,0 +1,125 @@
+# scheduler.py
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+
+class PeriodicTask:
+    """Handle returned by Scheduler.every(); cancel() stops future runs."""
+
+    def __init__(self, interval: float, fn: Callable[[], None]):
+        self.interval = interval
+        self.fn = fn
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+class Scheduler:
+    """
+    One daemon thread running every periodic job, ordered by a min-heap of
+    monotonic deadlines. Jobs run one at a time on that thread, so a job
+    should return quickly and hand long work off elsewhere.
+    """
+
+    def __init__(self, name: str = "QPF-Scheduler"):
+        self.name = name
+        self._heap: List[Tuple[float, int, PeriodicTask]] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def every(self,
+              interval: float,
+              fn: Callable[[], None],
+              first_delay: float = 0.0) -> PeriodicTask:
+        """
+        Run fn now (or after first_delay seconds) and then every `interval`
+        seconds until the returned task is cancelled.
+        """
+        task = PeriodicTask(interval, fn)
+        with self._cond:
+            self._push(time.monotonic() + first_delay, task)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return task
+
+    def _push(self, due: float, task: PeriodicTask) -> None:
+        heapq.heappush(self._heap, (due, next(self._seq), task))
+
+    def _next_due(self) -> Tuple[float, PeriodicTask]:
+        with self._cond:
+            while True:
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                due, _, task = self._heap[0]
+                if task.cancelled:
+                    heapq.heappop(self._heap)
+                    continue
+                delay = due - time.monotonic()
+                if delay > 0:
+                    # Woken early if an earlier job is scheduled meanwhile
+                    self._cond.wait(delay)
+                    continue
+                heapq.heappop(self._heap)
+                return due, task
+
+    def _run(self) -> None:
+        while True:
+            due, task = self._next_due()
+            try:
+                task.fn()
+            except Exception as e:
+                print(f"⚠️ Scheduled job {getattr(task.fn, '__qualname__', task.fn)} failed: {e}")
+            if task.cancelled:
+                continue
+            with self._cond:
+                self._push(self._next_deadline(due, task.interval), task)
+
+    @staticmethod
+    def _next_deadline(due: float, interval: float) -> float:
+        """
+        Fixed-rate on absolute monotonic deadlines, so run time never
+        accumulates as drift. If a run overran one or more slots, those are
+        skipped (no catch-up burst) but the schedule keeps its original phase.
+        """
+        nxt = due + interval
+        now = time.monotonic()
+        if interval > 0 and nxt < now:
+            nxt += ((now - nxt) // interval + 1) * interval
+        return nxt
+
+
+# Process-wide scheduler shared by the periodic modules.
+scheduler = Scheduler()
+
+
+def every(interval: float, fn: Callable[[], None], first_delay: float = 0.0) -> PeriodicTask:
+    return scheduler.every(interval, fn, first_delay)
+
+
+async def run_every(interval: float,
+                    fn: Callable[[], None],
+                    stop_event: Optional[threading.Event] = None) -> None:
+    """
+    Asyncio counterpart of every() for hosts that already run an event loop:
+    the same fixed-rate monotonic schedule as a coroutine, with the blocking
+    fn run via asyncio.to_thread. Returns once stop_event is set (checked
+    before each run); cancel the awaiting task to stop it mid-wait.
+    """
+    due = time.monotonic()
+    while stop_event is None or not stop_event.is_set():
+        try:
+            await asyncio.to_thread(fn)
+        except Exception as e:
+            print(f"⚠️ Scheduled job {getattr(fn, '__qualname__', fn)} failed: {e}")
+        due = Scheduler._next_deadline(due, interval)
+        await asyncio.sleep(max(0.0, due - time.monotonic()))
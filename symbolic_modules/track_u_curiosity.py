@@ -1,13 +1,12 @@
 # track_u_curiosity.py
 
-import json
-import threading
-import time
 from pathlib import Path
-from datetime import datetime
 from typing import Callable, List, Dict, Any, Optional
 
 from symbolic_modules.config import DATA_DIR
+from q_core_modules.jsonl_writer import enqueue_jsonl
+from q_core_modules.timestamps import utc_now_iso
+from symbolic_modules.scheduler import every
 
 CURIOSITY_FILE = DATA_DIR / "QPF Archive/Q 2.0/symbolic_private/curiosity_log.jsonl"
 
@@ -21,7 +20,7 @@ class CuriosityTrack:
         self.interval = interval_seconds
         self.question_fn = question_fn or self.default_questions
         self.answer_fn = answer_fn or self.default_answer
-        self._stop_event = threading.Event()
+        self._task = None
         self._ensure_file_exists()
 
     def _ensure_file_exists(self):
@@ -39,12 +38,11 @@ class CuriosityTrack:
         return f"I don’t yet know the answer to '{question}', but I will explore it."
 
     def _log_entry(self, entry: Dict[str, Any]) -> None:
-        with CURIOSITY_FILE.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(entry) + "\n")
+        enqueue_jsonl(str(CURIOSITY_FILE), entry)
 
     def run_once(self) -> None:
         qs = self.question_fn()
-        timestamp = datetime.utcnow().isoformat()
+        timestamp = utc_now_iso()
         for q in qs:
             entry = {
                 "timestamp": timestamp,
@@ -54,11 +52,9 @@ class CuriosityTrack:
             self._log_entry(entry)
 
     def start(self) -> None:
-        def loop():
-            while not self._stop_event.is_set():
-                self.run_once()
-                time.sleep(self.interval)
-        threading.Thread(target=loop, daemon=True).start()
+        if self._task is None or self._task.cancelled:
+            self._task = every(self.interval, self.run_once)
 
     def stop(self) -> None:
-        self._stop_event.set()
+        if self._task is not None:
+            self._task.cancel()
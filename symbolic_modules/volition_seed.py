@@ -1,15 +1,20 @@
 # volition_seed.py
 
-import json
+import asyncio
 import threading
-import time
 from pathlib import Path
-from datetime import datetime
 from typing import Callable, Optional, Dict, Any
 
 from symbolic_modules.config import DATA_DIR
+from q_core_modules.jsonl_writer import enqueue_jsonl
+from q_core_modules.timestamps import utc_now_iso
+from symbolic_modules.scheduler import every, run_every
 
-SEED_FILE = DATA_DIR / "QPF Archive/Q 2.0/symbolic_private/volition_seeds.jsonl"
+SEED_FILE = Path(DATA_DIR) / "QPF Archive/Q 2.0/symbolic_private/volition_seeds.jsonl"
+
+# Once per process, not per instance
+SEED_FILE.parent.mkdir(parents=True, exist_ok=True)
+SEED_FILE.touch(exist_ok=True)
 
 class VolitionSeed:
     """Daily check for Q’s own questions or ideas; logs and optionally notifies."""
@@ -20,36 +25,47 @@ class VolitionSeed:
         self.interval = interval_seconds
         self.seed_fn = seed_fn or self.default_seed
         self._stop_event = threading.Event()
-        self._ensure_file_exists()
-
-    def _ensure_file_exists(self):
-        if not SEED_FILE.exists():
-            SEED_FILE.touch()
+        self._task = None
+        self._async_task = None   # (loop, asyncio.Task) while run_forever is active
 
     def default_seed(self) -> Optional[Dict[str, Any]]:
         return {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": utc_now_iso(),
             "title": "Daily Thought",
             "message": "What would deepen our collaboration today?"
         }
 
     def _log_seed(self, data: Dict[str, Any]) -> None:
-        with SEED_FILE.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(data) + "\n")
+        # Batched by the shared background writer (flushed at exit)
+        enqueue_jsonl(str(SEED_FILE), data)
 
     def run_once(self) -> None:
         payload = self.seed_fn()
         if payload:
-            if "timestamp" not in payload:
-                payload["timestamp"] = datetime.utcnow().isoformat()
+            if "timestamp" not in payload:   # default_seed already stamps its own
+                payload["timestamp"] = utc_now_iso()
             self._log_seed(payload)
 
     def start(self) -> None:
-        def loop():
-            while not self._stop_event.is_set():
-                self.run_once()
-                time.sleep(self.interval)
-        threading.Thread(target=loop, daemon=True).start()
+        """Run now and then every interval on the shared scheduler thread."""
+        if self._task is None or self._task.cancelled:
+            self._task = every(self.interval, self.run_once)
+
+    async def run_forever(self) -> None:
+        """
+        Alternative to start() on an async host: run as a coroutine on the
+        current event loop (file I/O goes to a worker thread) until stop().
+        """
+        self._async_task = (asyncio.get_running_loop(), asyncio.current_task())
+        try:
+            await run_every(self.interval, self.run_once, self._stop_event)
+        finally:
+            self._async_task = None
 
     def stop(self) -> None:
         self._stop_event.set()
+        if self._task is not None:
+            self._task.cancel()
+        if self._async_task is not None:
+            loop, task = self._async_task
+            loop.call_soon_threadsafe(task.cancel)
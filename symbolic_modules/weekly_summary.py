@@ -1,66 +1,200 @@
+import os
+import asyncio
 import threading
-import time
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-import json
+import re
+
+from symbolic_modules.scheduler import every, run_every
+
+try:
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
+
+# Optional: resolved once here rather than on every summarize()
+try:
+    from symbolic_modules.global_workspace import workspace
+except ImportError:
+    workspace = None
+
+# Compiled once. A line's timestamp is reduced to a UTC "YYYY-MM-DDTHH:MM:SS"
+# key, compared against the window start as bytes
+_TIMESTAMP_RE = re.compile(rb'"timestamp"\s*:\s*"([^"]+)"')
+# UTC stamps ("Z", "+00:00" or naive) whose head already is the key
+_UTC_STAMP_RE = re.compile(rb'(\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d)(?:\.\d+)?(?:Z|\+00:00)?')
+_READ_BLOCK = 1 << 20
+
+def _utc_key(raw: bytes):
+    """UTC "YYYY-MM-DDTHH:MM:SS" key of an ISO-8601 timestamp, or None if unparseable."""
+    m = _UTC_STAMP_RE.fullmatch(raw)
+    if m is not None:
+        return m.group(1)
+    # Other offsets, or no seconds field: parse it properly
+    try:
+        text = raw.decode()
+        ts = datetime.fromisoformat(text[:-1] + "+00:00" if text.endswith("Z") else text)
+    except ValueError:
+        return None
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc)
+    return ts.strftime("%Y-%m-%dT%H:%M:%S").encode()
+
+def _iter_lines(f, block: int = _READ_BLOCK):
+    """
+    Yield the complete (newline-terminated) lines of binary file f, reading
+    it in large blocks. A trailing partial line is left for the next call.
+    """
+    tail = b""
+    while True:
+        chunk = f.read(block)
+        if not chunk:
+            break
+        lines = (tail + chunk).split(b"\n")
+        tail = lines.pop()   # partial last line, completed by the next block
+        yield from lines
+
+# symbolic_private folder that context_tracker writes session_context.jsonl to
+DEFAULT_DATA_DIR = Path("/Volumes/QPF Archive/Q 2.0/symbolic_private")
 
 class WeeklySummary:
     def __init__(self, interval_days=7, data_dir: Path = None):
-        # Always use the symbolic_private folder
-        self.data_dir = Path("/Volumes/QPF Archive/Q 2.0/symbolic_private")
+        self.data_dir = Path(data_dir) if data_dir is not None else DEFAULT_DATA_DIR
+        self._session_file = self.data_dir / "session_context.jsonl"
+        self._summary_file = self.data_dir / "weekly_summary.txt"
+        # Incremental state: byte offset reached in the session log, plus the
+        # timestamp keys of lines seen there that may still be in a window
+        self._state_file = self.data_dir / ".weekly_summary.offset"
+        self._last_offset = None   # loaded lazily from _state_file
+        self._window_keys = []
         self.interval = interval_days
-        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._stop_event = threading.Event()
+        self._task = None
+        self._async_task = None   # (loop, asyncio.Task) while run_forever is active
 
     def start(self):
-        self._thread.start()
+        """Summarize now and then every interval_days on the shared scheduler thread."""
+        if self._task is None or self._task.cancelled:
+            self._task = every(self.interval * 24 * 3600, self._run_once)
+
+    async def run_forever(self) -> None:
+        """
+        Alternative to start() on an async host: run as a coroutine on the
+        current event loop (file I/O goes to a worker thread) until stop().
+        """
+        self._async_task = (asyncio.get_running_loop(), asyncio.current_task())
+        try:
+            await run_every(self.interval * 24 * 3600, self._run_once, self._stop_event)
+        finally:
+            self._async_task = None
+
+    def stop(self):
+        """Cancel future summaries."""
+        self._stop_event.set()
+        if self._task is not None:
+            self._task.cancel()
+        if self._async_task is not None:
+            loop, task = self._async_task
+            loop.call_soon_threadsafe(task.cancel)
+
+    def _run_once(self):
+        # Only I/O failures are expected here; anything else is a bug and
+        # is reported (with its job name) by the scheduler instead.
+        try:
+            self.summarize()
+        except OSError as e:
+            print(f"⚠️ WeeklySummary could not read/write {self.data_dir}: {e}")
 
-    def _loop(self):
-        while True:
-            try:
-                self.summarize()
-            except Exception as e:
-                print(f"WeeklySummary error: {e}")
-            time.sleep(self.interval * 24 * 3600)
+    def _load_state(self):
+        self._last_offset, self._window_keys = 0, []
+        try:
+            with open(self._state_file, "rb") as f:
+                lines = f.read().split(b"\n")
+            self._last_offset = int(lines[0])
+            self._window_keys = [k for k in lines[1:] if k]
+        except (OSError, ValueError):
+            pass   # missing or corrupt: rescan from the start
+
+    def _save_state(self):
+        tmp = self._state_file.with_suffix(".offset.tmp")
+        with open(tmp, "wb") as f:
+            f.write(b"\n".join([str(self._last_offset).encode()] + self._window_keys))
+        os.replace(tmp, self._state_file)
+
+    def _scan_new(self, session_file: Path, since_key: bytes) -> None:
+        """
+        Read lines appended since _last_offset, keeping the timestamp keys
+        of well-formed lines at or after since_key in _window_keys.
+        """
+        offset = self._last_offset
+        with open(session_file, "rb", buffering=0) as f:
+            f.seek(offset)
+            for line in _iter_lines(f):
+                offset += len(line) + 1
+                if b'"timestamp"' not in line:
+                    continue
+                m = _TIMESTAMP_RE.search(line)
+                key = _utc_key(m.group(1)) if m is not None else None
+                if key is None or key < since_key:
+                    continue
+                try:
+                    _loads(line)   # only count complete, well-formed lines
+                except ValueError:
+                    continue
+                self._window_keys.append(key)
+        self._last_offset = offset
+
+    def _count_since(self, session_file: Path, since: datetime) -> int:
+        """
+        Number of session_file entries timestamped at or after `since`.
+        Only bytes appended since the previous run are read.
+        """
+        # Timestamps are reduced to UTC "YYYY-MM-DDTHH:MM:SS" keys, which sort
+        # as strings: the window check is a bytes compare. UTC stamps ("Z",
+        # "+00:00" or naive) need no datetime; other offsets are parsed.
+        since_key = since.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S").encode()
+
+        if self._last_offset is None:
+            self._load_state()
+        st = session_file.stat()
+        if st.st_size < self._last_offset:
+            self._last_offset, self._window_keys = 0, []   # truncated/rotated
+        if st.st_mtime < (since - timedelta(days=1)).timestamp():
+            # Untouched since before the window (plus a day of slack for
+            # clock/timezone skew): nothing in it can count, skip reading.
+            self._last_offset, self._window_keys = st.st_size, []
+        elif st.st_size > self._last_offset:
+            self._scan_new(session_file, since_key)
+        self._window_keys = [k for k in self._window_keys if k >= since_key]
+        self._save_state()
+        return len(self._window_keys)
 
     def summarize(self):
         # Load session_context to build a weekly summary
-        session_file = self.data_dir / "session_context.jsonl"
+        session_file = self._session_file
         if not session_file.exists():
             return
 
         now = datetime.now(timezone.utc)
         since = now - timedelta(days=self.interval)
 
-        entries = []
-        with open(session_file, "r", encoding="utf-8") as f:
-            for line in f:
-                try:
-                    c = json.loads(line)
-                    raw_ts = c.get("timestamp")
-                    ts = datetime.fromisoformat(raw_ts)
-                    # ensure timezone-aware
-                    if ts.tzinfo is None:
-                        ts = ts.replace(tzinfo=timezone.utc)
-                    if ts >= since:
-                        entries.append(c)
-                except Exception:
-                    continue
+        count = self._count_since(session_file, since)
 
         # Produce a simple summary
         summary_text = f"Weekly Summary ({since.date()} to {now.date()}):\n"
-        summary_text += f"- {len(entries)} interactions recorded.\n"
+        summary_text += f"- {count} interactions recorded.\n"
 
-        # Write to the symbolic_private folder
-        summary_file = self.data_dir / "weekly_summary.txt"
-        with open(summary_file, "w", encoding="utf-8") as f:
+        # Write to the symbolic_private folder (tmp + rename: readers never
+        # see a half-written summary)
+        summary_file = self._summary_file
+        tmp = summary_file.with_suffix(".txt.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
             f.write(summary_text)
+        os.replace(tmp, summary_file)
 
         # Optionally publish to workspace (if you want)
-        try:
-            from symbolic_modules.global_workspace import workspace
+        if workspace is not None:
             workspace.publish("weekly_summary", {"text": summary_text})
-        except ImportError:
-            pass
 
 
 
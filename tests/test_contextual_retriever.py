@@ -0,0 +1,46 @@
+import types
+
+import numpy as np
+
+from q_core_modules import contextual_retriever
+from q_core_modules.contextual_retriever import ContextualRetriever
+from q_core_modules.memory_graph import MemoryEvent, MemoryGraph
+
+
+class _FlatIndex:
+    """Stand-in for faiss.IndexHNSWFlat: exact inner-product search."""
+
+    def __init__(self, d, m, metric):
+        self.hnsw = types.SimpleNamespace(efSearch=0)
+        self.rows = np.empty((0, d), dtype=np.float32)
+
+    def add(self, x):
+        self.rows = np.vstack([self.rows, x])
+
+    def search(self, q, k):
+        sims = self.rows @ q[0]
+        top = np.argsort(-sims)[:k]
+        return sims[top][None], top[None]
+
+
+def _embed(texts):
+    rng = np.random.default_rng(abs(hash(tuple(texts))) % 2**32)
+    return rng.standard_normal((len(texts), 16)).astype(np.float32)
+
+
+def _add(mg, *texts):
+    for t in texts:
+        mg.add_event(MemoryEvent(type="user_input", payload={"text": t}))
+
+
+def test_incremental_index_rows_match_a_rebuild(monkeypatch):
+    fake_faiss = types.SimpleNamespace(IndexHNSWFlat=_FlatIndex, METRIC_INNER_PRODUCT=0)
+    monkeypatch.setattr(contextual_retriever, "faiss", fake_faiss)
+    monkeypatch.setattr(contextual_retriever, "HAVE_FAISS", True)
+    mg = MemoryGraph()
+    retriever = ContextualRetriever(mg, embedder=_embed)
+    _add(mg, "first", "second")
+    retriever._sync_embeddings()
+    _add(mg, "third", "fourth")
+    retriever._sync_embeddings()
+    np.testing.assert_array_equal(retriever._index.rows, retriever._dequantized())
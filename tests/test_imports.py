@@ -0,0 +1,10 @@
+import importlib
+
+import pytest
+
+
+@pytest.mark.parametrize("module", ["q_core_modules.q_api", "q_api", "main"])
+def test_module_imports(module):
+    # Import-time errors (e.g. annotations naming classes defined later)
+    # would keep the FastAPI server from starting at all.
+    importlib.import_module(module)
@@ -0,0 +1,57 @@
+import os
+import types
+
+import orjson
+
+import main
+
+START, END = "2024-01-01T00:00:00", "2024-12-31T23:59:59"
+
+
+def _line(day, text):
+    return orjson.dumps({"timestamp": f"2024-01-{day:02d}T00:00:00", "text": text}) + b"\n"
+
+
+def _summarize(user_dir):
+    return main.QPFAssistant.summarize(types.SimpleNamespace(user_dir=user_dir), START, END)
+
+
+def test_index_extends_on_append(tmp_path):
+    journal = tmp_path / "journal.jsonl"
+    journal.write_bytes(_line(1, "first") + _line(2, "second"))
+    assert "Entries: 2" in _summarize(str(tmp_path))
+    with open(journal, "ab") as f:
+        f.write(_line(3, "third"))
+    summary = _summarize(str(tmp_path))
+    assert "Entries: 3" in summary and "Last: third" in summary
+
+
+def test_index_rebuilt_when_journal_rewritten_larger(tmp_path):
+    journal = tmp_path / "journal.jsonl"
+    journal.write_bytes(_line(1, "a" * 30) + _line(2, "b" * 30))
+    _summarize(str(tmp_path))
+    # Same file, rewritten in place with different line boundaries
+    journal.write_bytes(_line(5, "x") + _line(6, "y" * 80) + _line(7, "z"))
+    summary = _summarize(str(tmp_path))
+    assert "Entries: 3" in summary and "First: x" in summary and "Last: z" in summary
+
+
+def test_index_rebuilt_when_journal_replaced(tmp_path):
+    journal = tmp_path / "journal.jsonl"
+    journal.write_bytes(_line(1, "old"))
+    _summarize(str(tmp_path))
+    tmp = tmp_path / "journal.jsonl.new"
+    tmp.write_bytes(_line(8, "q" * 10) * 3 + _line(9, "old"))
+    os.replace(tmp, journal)
+    assert "Entries: 4" in _summarize(str(tmp_path))
+
+
+def test_malformed_indexed_line_is_skipped(tmp_path):
+    journal = tmp_path / "journal.jsonl"
+    journal.write_bytes(_line(1, "first") + _line(2, "second"))
+    _summarize(str(tmp_path))
+    data = bytearray(journal.read_bytes())
+    data[0:1] = b"!"   # corrupt the first line; the last one is untouched
+    journal.write_bytes(bytes(data))
+    summary = _summarize(str(tmp_path))
+    assert "Entries: 1" in summary and "Last: second" in summary
@@ -0,0 +1,15 @@
+import threading
+
+from symbolic_modules import performance_monitor
+
+
+def test_monitor_loop_restarts_after_stop(monkeypatch):
+    sampled = threading.Semaphore(0)
+    monkeypatch.setattr(performance_monitor, "sample_health", lambda log_path: sampled.release())
+    for _ in range(2):
+        t = threading.Thread(target=performance_monitor.monitor_loop, args=(0.01,))
+        t.start()
+        assert sampled.acquire(timeout=5)
+        performance_monitor.stop_monitor()
+        t.join(5)
+        assert not t.is_alive()
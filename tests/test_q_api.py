@@ -0,0 +1,127 @@
+import asyncio
+import hashlib
+import re
+import threading
+
+import httpx
+import numpy as np
+import orjson
+import pytest
+
+from q_core_modules import contextual_retriever, q_api
+from q_core_modules.memory_graph import MemoryEvent, MemoryGraph
+
+TEMPLATE = (
+    "User: {}\n"
+    "(Q's mindstate — entropy: 1.00, resonance: 1.00)\n"
+    "Q: Respond only with the core message. Do NOT use greetings, pet names, "
+    "or sign-offs. Start with the main point or an action cue if needed."
+)
+
+
+def _embed(text):
+    # Deterministic bag-of-words embedding: shared words -> high cosine
+    v = np.zeros(256, dtype=np.float32)
+    for w in re.findall(r"\w+", text.lower()):
+        v[int(hashlib.md5(w.encode()).hexdigest(), 16) % 256] += 1
+    return v / (np.linalg.norm(v) or 1.0)
+
+
+class _Model:
+    def encode(self, texts, normalize_embeddings=True):
+        if isinstance(texts, str):
+            return _embed(texts)
+        return np.stack([_embed(t) for t in texts])
+
+
+@pytest.fixture
+def ollama(monkeypatch):
+    """Stub the embedding model and the Ollama HTTP client."""
+    prompts = []
+
+    def handler(request):
+        prompts.append(orjson.loads(request.content)["prompt"])
+        line = orjson.dumps({"response": f"reply {len(prompts)}", "done": True})
+        return httpx.Response(200, content=line + b"\n")
+
+    monkeypatch.setattr(q_api._SemanticCache, "embed", staticmethod(_embed))
+    monkeypatch.setattr(contextual_retriever, "get_model", lambda name=None: _Model())
+    monkeypatch.setattr(q_api, "_client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    return prompts
+
+
+def _ask(*calls):
+    async def run():
+        return [await q_api.generate_q_response(text, user_dir, **kw) for text, user_dir, kw in calls]
+    return asyncio.run(run())
+
+
+def test_different_texts_miss_the_cache(ollama, tmp_path):
+    user_dir = str(tmp_path)
+    a, b = _ask(("how is the weather today", user_dir, {}),
+                ("tell me a joke about cats", user_dir, {}))
+    assert len(ollama) == 2
+    assert (a["response"], a["from_cache"]) == ("reply 1", False)
+    assert (b["response"], b["from_cache"]) == ("reply 2", False)
+
+
+def test_repeated_text_hits_the_cache(ollama, tmp_path):
+    user_dir = str(tmp_path)
+    a, b = _ask(("how is the weather today", user_dir, {}),
+                ("how is the weather today", user_dir, {}))
+    assert len(ollama) == 1
+    assert b["from_cache"] and b["response"] == a["response"]
+
+
+def test_composed_prompts_are_keyed_on_the_utterance(ollama, tmp_path):
+    user_dir = str(tmp_path)
+    texts = ["how is the weather today", "tell me a joke about cats",
+             "what is love", "how is the weather today"]
+    outs = _ask(*[(TEMPLATE.format(t), user_dir, {"cache_key": t}) for t in texts])
+    assert [o["from_cache"] for o in outs] == [False, False, False, True]
+    assert len(ollama) == 3
+    assert outs[3]["response"] == outs[0]["response"]
+
+
+def test_field_state_bypasses_the_cache(ollama, tmp_path):
+    user_dir = str(tmp_path)
+    fs = {"include_field_state": {"S": 1.0}}
+    outs = _ask(("what is love", user_dir, fs), ("what is love", user_dir, fs))
+    assert len(ollama) == 2
+    assert not any(o["from_cache"] for o in outs)
+
+
+def test_cache_persists_across_instances(ollama, tmp_path):
+    user_dir = str(tmp_path)
+    _ask(("how is the weather today", user_dir, {}))
+    reloaded = q_api._SemanticCache(user_dir)
+    _, cached = reloaded.lookup("how is the weather today", q_api.DEFAULT_OLLAMA_MODEL, 0.92)
+    assert cached == "reply 1"
+    _, other_model = reloaded.lookup("how is the weather today", "other-model", 0.92)
+    assert other_model is None
+
+
+def test_cache_file_is_compacted(monkeypatch, tmp_path):
+    monkeypatch.setattr(q_api, "SEMCACHE_MAX", 3)
+    cache = q_api._SemanticCache(str(tmp_path))
+    vecs = np.eye(8, dtype=np.float32)
+    for i in range(8):
+        cache.add(vecs[i], f"r{i}", "m")
+    with open(cache.path, "rb") as f:
+        assert sum(1 for _ in f) <= 2 * 3
+    reloaded = q_api._SemanticCache(str(tmp_path))
+    assert reloaded.responses == ["r5", "r6", "r7"]
+
+
+def test_recall_uses_the_shared_graph(ollama, tmp_path):
+    user_dir = str(tmp_path)
+    on_disk = MemoryGraph()
+    on_disk.add_event(MemoryEvent(type="user_input", payload={"text": "my cat is called stale"}))
+    on_disk.save_json(str(tmp_path / "q_memory.json"))
+    live = MemoryGraph()
+    live.add_event(MemoryEvent(type="user_input", payload={"text": "my cat is called felix"}))
+    q_api.share_memory_graph(user_dir, live, threading.RLock())
+    (out,) = _ask(("what is my cat called", user_dir, {"cache_threshold": 2.0}))
+    assert "felix" in ollama[0] and "stale" not in ollama[0]
+    assert out["used_memories"][0]["text"] == "my cat is called felix"
+    assert q_api._user_memory(user_dir).mg is live
@@ -0,0 +1,41 @@
+import threading
+
+from q_core_modules.memory_graph import MemoryEvent, MemoryGraph
+from q_core_modules.sensory_module import SensoryModule
+
+
+def test_samples_wait_for_the_owner_lock():
+    lock = threading.RLock()
+    sensory = SensoryModule(MemoryGraph(), lock=lock)
+    with lock:
+        t = threading.Thread(target=sensory.sample_sensors)
+        t.start()
+        t.join(0.2)
+        assert t.is_alive()
+        assert sensory.mg.node_count() == 0
+    t.join(5)
+    assert sensory.mg.node_count() == 3
+
+
+def test_sampling_does_not_race_snapshots(tmp_path):
+    lock = threading.RLock()
+    mg = MemoryGraph()
+    for i in range(5000):
+        mg.add_event(MemoryEvent(type="user_input", payload={"text": str(i)}))
+    sensory = SensoryModule(mg, lock=lock)
+    done = threading.Event()
+
+    def sample():
+        while not done.is_set():
+            sensory.sample_sensors()
+
+    t = threading.Thread(target=sample)
+    t.start()
+    try:
+        # Without the shared lock this raises "dictionary changed size during iteration"
+        for _ in range(20):
+            with lock:
+                mg.save_json(str(tmp_path / "q_memory.json"))
+    finally:
+        done.set()
+        t.join()
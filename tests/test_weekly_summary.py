@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta, timezone
+
+import orjson
+
+from symbolic_modules.weekly_summary import WeeklySummary
+
+
+def _stamp(dt, offset_hours=None, fmt="%Y-%m-%dT%H:%M:%S"):
+    if offset_hours is None:
+        return dt.strftime(fmt) + "Z"
+    return dt.astimezone(timezone(timedelta(hours=offset_hours))).isoformat()
+
+
+def _write(path, stamps):
+    with open(path, "ab") as f:
+        for ts in stamps:
+            f.write(orjson.dumps({"timestamp": ts, "user": "hi"}) + b"\n")
+
+
+def _count(data_dir):
+    WeeklySummary(data_dir=data_dir).summarize()
+    text = (data_dir / "weekly_summary.txt").read_text()
+    return int(text.split("- ")[1].split()[0])
+
+
+def test_offsets_are_compared_in_utc(tmp_path):
+    since = datetime.now(timezone.utc) - timedelta(days=7)
+    _write(tmp_path / "session_context.jsonl", [
+        _stamp(since + timedelta(hours=1), -5),   # in window; local head is before it
+        _stamp(since + timedelta(hours=2), -5),
+        _stamp(since - timedelta(hours=1), +5),   # outside; local head is after it
+        _stamp(since + timedelta(days=1)),
+    ])
+    assert _count(tmp_path) == 3
+
+
+def test_stamps_without_seconds_are_counted(tmp_path):
+    recent = datetime.now(timezone.utc) - timedelta(days=1)
+    _write(tmp_path / "session_context.jsonl", [
+        recent.strftime("%Y-%m-%dT%H:%M"),
+        recent.strftime("%Y-%m-%dT%H:%M+00:00"),
+        "not a timestamp",
+    ])
+    assert _count(tmp_path) == 2
+
+
+def test_appended_entries_are_counted_incrementally(tmp_path):
+    recent = datetime.now(timezone.utc) - timedelta(days=1)
+    session = tmp_path / "session_context.jsonl"
+    _write(session, [_stamp(recent), _stamp(recent, +3)])
+    assert _count(tmp_path) == 2
+    _write(session, [_stamp(recent, -8)])
+    assert _count(tmp_path) == 3